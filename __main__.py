@@ -2,54 +2,75 @@
 Odoo Module Analyzer for Upgrade Planning with improved error handling
 
 This script analyzes Odoo modules to help plan a reorganization for upgrade from v14 to v17.
+It only needs the standard library (lxml is optional), so it also runs under PyPy, whose JIT
+speeds up the AST and XML parsing passes: pypy3 __main__.py --dir <path> ...
 """
 import argparse
-import csv
+import atexit
 import logging
+import logging.handlers
 import os
 import sys
-import traceback
 import time
 import warnings
+from collections import defaultdict
+from functools import lru_cache
+from itertools import chain
+from types import SimpleNamespace
 
 # Suppress SyntaxWarnings from analyzed Python files (not our code)
 # These warnings come from regex patterns in the source files being analyzed
 warnings.filterwarnings('ignore', category=SyntaxWarning, message='.*invalid escape sequence.*')
 
+from models.field import format_module_set
 from models.registry import ModelRegistry
 from parsers.manifest_parser import parse_manifest_files
-from parsers.python_parser import parse_python_files
+from parsers.python_parser import parse_python_file_isolated
 from parsers.xml_parser import parse_xml_files
-from analysis.module_analyzer import ModuleAnalyzer
-from analysis.recommendations import generate_restructuring_recommendations
-from analysis.module_consolidation import analyze_module_consolidation
 from analysis.module_summary import generate_module_summary
-from analysis.migration_analysis import analyze_migration
 from analysis.csl_models import export_csl_models
-from utils.file_utils import get_safe_files, get_custom_modules
+from exporters.csv_exporter import write_csv_rows
+from utils.file_utils import get_files_by_extension, get_safe_files_by_extension, get_custom_modules
+from utils.worker_pool import create_worker_pool
 
 import config
 
 # Configure logging
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# The log file is written through a memory buffer so records reach the disk in batches;
+# warnings and errors flush the buffer right away. The buffer doesn't format records, its target does.
+_log_file_target = logging.FileHandler('odoo_analyzer.log')
+_log_file_target.setFormatter(logging.Formatter(LOG_FORMAT))
+_log_file_handler = logging.handlers.MemoryHandler(capacity=1024, flushLevel=logging.WARNING,
+                                                   target=_log_file_target)
+atexit.register(_log_file_handler.flush)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('odoo_analyzer.log'),
+        _log_file_handler,
         logging.StreamHandler(sys.stdout)
     ]
 )
 logger = logging.getLogger(__name__)
 
 
-def parse_args():
-    """Parse command line arguments"""
+@lru_cache(maxsize=None)
+def _build_arg_parser():
+    """Build the command line parser once; repeated parse_args() calls reuse it"""
     parser = argparse.ArgumentParser(description='Analyze Odoo modules for upgrade planning')
     parser.add_argument('--dir', type=str, required=True, help='Path to Odoo custom modules directory')
     parser.add_argument('--output', type=str, default='./analysis_results', help='Output directory for results')
     parser.add_argument('--custom-only', action='store_true',
                         help='Only analyze custom modules, skip standard Odoo modules')
     parser.add_argument('--skip-problematic', action='store_true', help='Skip files that might cause parsing issues')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes used to parse modules (1 = parse in-process)')
+    parser.add_argument('--cache-dir', type=str, default=config.PARSE_CACHE_DIR,
+                        help='Directory of the on-disk cache of parsed files (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true', help='Parse every file without using the on-disk cache')
+    parser.add_argument('--debug', action='store_true',
+                        help='Log debug messages and attach tracebacks to logged errors')
 
     # Additional analysis options
     parser.add_argument('--analyze-sharing', action='store_true', help='Analyze field sharing across modules')
@@ -68,8 +89,49 @@ def parse_args():
                         help='Path to original codebase (default: C:\\Odoo\\sh\\src\\user)')
     parser.add_argument('--new-dir', type=str, default=r'C:\Cursor\Odoo\csl_addons\odoo',
                         help='Path to new codebase (default: C:\\Cursor\\Odoo\\csl_addons\\odoo)')
+    parser.add_argument('--common-dir', type=str, default=None,
+                        help='Path to modules shared by both codebases (e.g. Odoo core addons), parsed only once')
 
-    return parser.parse_args()
+    return parser
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments
+
+    Args:
+        argv: Arguments to parse (defaults to sys.argv[1:])
+    """
+    return _build_arg_parser().parse_args(argv)
+
+
+# CSV files written by main(), by the name their paths are available under in get_output_paths()
+OUTPUT_FILES = {
+    'fields_analysis': 'fields_analysis.csv',
+    'method_overrides': 'method_overrides.csv',
+    'model_inheritance': 'model_inheritance.csv',
+    'field_usage': 'field_usage.csv',
+    'shared_fields': 'shared_fields.csv',
+    'field_dependencies': 'field_dependencies.csv',
+    'field_dependencies_summary': 'field_dependencies_summary.csv',
+    'view_field_analysis': 'view_field_analysis.csv',
+    'core_candidates': 'core_candidates.csv',
+    'shared_methods': 'shared_methods.csv',
+    'utility_candidates': 'utility_candidates.csv',
+}
+
+# Files written by the restructuring recommendations
+RECOMMENDATION_OUTPUT_FILES = [
+    'restructuring_recommendations.md',
+    'modules_to_move_to_csl_core.csv',
+    'migration_priority.csv'
+]
+
+
+def get_output_paths(output_dir):
+    """Get the paths of the CSV files written by main() as attributes named after OUTPUT_FILES keys"""
+    return SimpleNamespace(**{name: os.path.join(output_dir, filename)
+                              for name, filename in OUTPUT_FILES.items()})
 
 
 def check_output_files_writable(output_dir, args):
@@ -81,30 +143,23 @@ def check_output_files_writable(output_dir, args):
         tuple: (is_writable: bool, issues: list of error messages)
     """
     issues = []
-    output_files = []
     
     # Always created files
-    output_files.append('fields_analysis.csv')
-    output_files.append('method_overrides.csv')
+    output_files = [OUTPUT_FILES[name] for name in
+                    ('fields_analysis', 'method_overrides', 'model_inheritance', 'field_usage')]
     
     # Conditionally created files
     if args.analyze_sharing:
-        output_files.extend([
-            'shared_fields.csv',
-            'field_dependencies.csv',
-            'field_dependencies_summary.csv',
-            'view_field_analysis.csv',
-            'core_candidates.csv',
-            'shared_methods.csv',
-            'utility_candidates.csv'
-        ])
+        output_files.extend(OUTPUT_FILES[name] for name in
+                            ('shared_fields', 'field_dependencies', 'field_dependencies_summary',
+                             'view_field_analysis'))
+
+    if args.identify_core:
+        output_files.extend(OUTPUT_FILES[name] for name in
+                            ('core_candidates', 'shared_methods', 'utility_candidates'))
     
     if args.generate_recommendations:
-        output_files.extend([
-            'restructuring_recommendations.md',
-            'modules_to_move_to_csl_core.csv',
-            'migration_priority.csv'
-        ])
+        output_files.extend(RECOMMENDATION_OUTPUT_FILES)
     
     # First, check if directory is writable
     try:
@@ -116,53 +171,241 @@ def check_output_files_writable(output_dir, args):
         issues.append(f"Cannot write to output directory '{output_dir}': {e}")
         return False, issues
     
-    # Check each file
+    # List the directory once instead of probing every file name
+    try:
+        with os.scandir(output_dir) as entries:
+            existing_files = {entry.name for entry in entries if entry.is_file()}
+    except OSError as e:
+        issues.append(f"Cannot list output directory '{output_dir}': {e}")
+        return False, issues
+
+    # Check each existing file
     for filename in output_files:
+        if filename not in existing_files:
+            continue
         file_path = os.path.join(output_dir, filename)
-        
-        # Check if file exists and is locked
-        if os.path.exists(file_path):
-            try:
-                # Try to open in write mode (this will fail if file is locked by another process)
-                # On Windows, this will raise PermissionError if file is open in Excel
-                with open(file_path, 'r+b') as f:
-                    # File is not locked, we can proceed
-                    pass
-            except PermissionError:
-                issues.append(f"File is locked (likely open in Excel or another program): {file_path}")
-            except Exception as e:
-                issues.append(f"Cannot access file {file_path}: {e}")
+
+        try:
+            # Try to open in write mode (this will fail if file is locked by another process)
+            # On Windows, this will raise PermissionError if file is open in Excel
+            fd = os.open(file_path, os.O_RDWR)
+            # File is not locked, we can proceed
+            os.close(fd)
+        except PermissionError:
+            issues.append(f"File is locked (likely open in Excel or another program): {file_path}")
+        except Exception as e:
+            issues.append(f"Cannot access file {file_path}: {e}")
     
     return len(issues) == 0, issues
 
 
-def export_csv(data, file_path, field_names):
-    """Export data to CSV"""
+def export_csv(data, file_path, field_names=None):
+    """
+    Export data to CSV
+
+    Args:
+        data: Iterable of row dictionaries (a generator is streamed without being materialized)
+        file_path: Path of the CSV file to write
+        field_names: Columns to export. If None, the keys of the first row are used and
+                     nothing is written when there are no rows.
+    """
+    if field_names is None:
+        rows = iter(data)
+        first_row = next(rows, None)
+        if first_row is None:
+            logger.info(f"No data to export to {file_path}")
+            return
+        field_names = list(first_row.keys())
+        data = chain([first_row], rows)
+
+    field_names = list(field_names)
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
     try:
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=field_names)
-            writer.writeheader()
-            for item in data:
-                # Ensure all fields are present, filling in blanks if needed
-                row = {field: item.get(field, '') for field in field_names}
-                writer.writerow(row)
+        write_csv_rows(file_path, field_names, data)
         logger.info(f"Exported data to {file_path}")
     except Exception as e:
         logger.error(f"Error exporting data to {file_path}: {e}")
 
 
+def _iter_field_dicts(registry, eligible_modules, field_usage, summary_fields=None):
+    """
+    Yield export dictionaries for every field definition in the registry
+
+    Args:
+        registry: ModelRegistry with normalized field keys
+        eligible_modules: Set of eligible module names (for is_eligible_module flag)
+        field_usage: Dictionary of field_key -> list of usage dicts (for usage stats)
+        summary_fields: Optional list that collects the rows belonging to eligible modules
+    """
+    # Usage stats are summarized once per field key, not once per definition
+    usage_summaries = {}
+    for model_name, model_fields in registry.fields.items():
+        for field_name, fields_list in model_fields.items():
+            for field in fields_list:
+                try:
+                    # Pass eligible_modules and field_usage to populate usage stats and eligible flag
+                    field_dict = field.to_dict(eligible_modules=eligible_modules, field_usage=field_usage,
+                                               usage_summaries=usage_summaries)
+                except Exception as e:
+                    logger.error(f"Error converting field to dict: {e}")
+                    continue
+
+                if summary_fields is not None and (field_dict['module'] in eligible_modules or
+                                                   field_dict['root_module'] in eligible_modules):
+                    summary_fields.append(field_dict)
+                yield field_dict
+
+
+# Model name prefixes of standard Odoo modules, used to guess the module of inherited models
+STANDARD_ODOO_PREFIXES = frozenset({'mail', 'product', 'sale', 'purchase', 'account', 'stock',
+                                    'project', 'hr', 'base', 'web', 'portal', 'website'})
+
+
+def _resolve_inherited_module(inherited_model, module_by_model):
+    """
+    Get the module of an inherited model, which may not be in the registry if it's a standard Odoo model
+
+    Args:
+        inherited_model: Name of the inherited model
+        module_by_model: Dictionary of model name -> module of the models in the registry
+    """
+    if inherited_model in module_by_model:
+        return module_by_model[inherited_model]
+    if isinstance(inherited_model, str) and '.' in inherited_model:
+        # Infer from model name (e.g., "mail.thread" -> "mail", "product.template" -> "product")
+        model_prefix = inherited_model.partition('.')[0]
+        if model_prefix in STANDARD_ODOO_PREFIXES:
+            return model_prefix
+    return 'unknown'
+
+
+def _iter_inheritance_rows(registry):
+    """Yield export dictionaries for every model inheritance relationship in the registry"""
+    # Index the modules of the registered models once instead of per relationship
+    module_by_model = {model_name: model_info.get('module', 'unknown')
+                       for model_name, model_info in registry.models.items()}
+
+    # First, handle models with _name that inherit other models
+    for model_name, inherited_models in registry.inherits.items():
+        if model_name in module_by_model:
+            model_module = module_by_model[model_name]
+            for inherited_model in inherited_models:
+                # Skip None values
+                if not inherited_model:
+                    continue
+                yield {
+                    'model': model_name,
+                    'module': model_module,
+                    'inherited_model': inherited_model,
+                    'inherited_module': _resolve_inherited_module(inherited_model, module_by_model)
+                }
+
+    # Also handle extension-only classes (no _name, just _inherit)
+    for module, extensions in registry.module_extensions.items():
+        for model_name, inherited_model in extensions:
+            # Skip None values
+            if not model_name or not inherited_model:
+                continue
+            yield {
+                'model': model_name,
+                'module': module,
+                'inherited_model': inherited_model,
+                'inherited_module': _resolve_inherited_module(inherited_model, module_by_model)
+            }
+
+
+# Number of files handed to a parser worker at a time
+PARSE_BATCH_SIZE = 16
+
+# Registry snapshot used by XML parser workers (set by _set_worker_registry)
+_worker_registry = None
+
+
+def _set_worker_registry(registry):
+    """Initialize a parser worker process with the registry snapshot"""
+    global _worker_registry
+    _worker_registry = registry
+
+
+def _parse_py_worker(file_paths):
+    """
+    Parse a batch of Python files, each into its own private registry
+
+    Each file is parsed in isolation so the results don't depend on how files are batched;
+    bulk_ingest links fields to parents defined in other files.
+
+    Returns:
+        list: (partial_registry, fields, method_overrides, methods) tuple of each file
+    """
+    results = []
+    for file_path in file_paths:
+        if file_path.endswith('__manifest__.py'):
+            continue
+
+        partial_registry, fields, method_overrides, methods = result = parse_python_file_isolated(file_path)
+        # Files without definitions (e.g. __init__.py) aren't sent back to the parent at all
+        if fields or method_overrides or methods or partial_registry.has_definitions():
+            results.append(result)
+    return results
+
+
+def _parse_xml_worker(file_paths):
+    """
+    Parse a batch of XML files against the worker's registry snapshot
+
+    Returns:
+        tuple: (field_usage, views) where views are the view definitions registered while parsing
+    """
+    registry = _worker_registry
+    field_usage = {}
+    known_views = set(registry.views)
+
+    try:
+        # Parse the files as one batch; a failing file is logged and skipped
+        field_usage = parse_xml_files(file_paths, registry)
+    except Exception as e:
+        logger.error(f"Error processing XML file batch starting with {file_paths[0]}: {e}",
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
+
+    views = {view_id: view for view_id, view in registry.views.items() if view_id not in known_views}
+    return field_usage, views
+
+
+def _run_parse_tasks(worker, file_paths, max_workers, registry=None):
+    """
+    Run a parser worker over batches of PARSE_BATCH_SIZE files
+
+    Uses a process pool when more than one worker and batch are available, otherwise
+    runs in-process. Results are returned in file_paths order so output stays deterministic.
+    """
+    batches = [file_paths[i:i + PARSE_BATCH_SIZE] for i in range(0, len(file_paths), PARSE_BATCH_SIZE)]
+    max_workers = min(max_workers, len(batches))
+    if max_workers <= 1:
+        global _worker_registry
+        _worker_registry = registry
+        return [worker(batch) for batch in batches]
+
+    logger.info(f"Parsing {len(file_paths)} files with {max_workers} worker processes")
+    with create_worker_pool(max_workers, _set_worker_registry, (registry,)) as executor:
+        return list(executor.map(worker, batches))
+
+
 def main():
     """Main function with improved error handling"""
     start_time = time.time()
     args = parse_args()
 
     # Set configuration
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+
     config.BASE_DIR = args.dir
+    config.PARSE_CACHE_DIR = None if args.no_cache else args.cache_dir
     output_dir = args.output
 
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
+    output_paths = get_output_paths(output_dir)
     
     # Check if output files are writable before starting processing
     logger.info("Checking if output files are writable...")
@@ -195,40 +438,36 @@ def main():
         else:
             custom_module_paths = [config.BASE_DIR]  # Process everything
 
+        # Find the files of each module in one walk shared by the Python and XML passes
+        if args.skip_problematic:
+            # Use safer file filtering
+            module_files = [get_safe_files_by_extension(module_path, ['.py', '.xml'], exclude_patterns=['test_', 'demo_'])
+                            for module_path in custom_module_paths]
+        else:
+            module_files = [get_files_by_extension(module_path, ['.py', '.xml']) for module_path in custom_module_paths]
+
         # Parse Python files to extract model and field definitions
         logger.info("Parsing Python files...")
-        all_fields = []
-        all_method_overrides = []
-        all_methods = []
-
-        for module_path in custom_module_paths:
-            try:
-                logger.info(f"Processing Python files in {module_path}")
-                if args.skip_problematic:
-                    # Use safer file filtering
-                    python_files = get_safe_files(module_path, '.py', exclude_patterns=['test_', 'demo_'])
-
-                    # Process files individually to avoid one bad file breaking everything
-                    for file_path in python_files:
-                        try:
-                            fields, method_overrides, methods = parse_python_files([file_path], registry)
-                            all_fields.extend(fields)
-                            all_method_overrides.extend(method_overrides)
-                            all_methods.extend(methods)
-                        except Exception as e:
-                            logger.error(f"Error processing Python file {file_path}: {e}")
-                            continue
-                else:
-                    # Process entire module
-                    fields, method_overrides, methods = parse_python_files(module_path, registry)
-                    all_fields.extend(fields)
-                    all_method_overrides.extend(method_overrides)
-                    all_methods.extend(methods)
-            except Exception as e:
-                logger.error(f"Error processing Python files in module {module_path}: {e}")
-                logger.error(traceback.format_exc())
-
-        logger.info(f"Found {len(all_fields)} field definitions, {len(all_method_overrides)} method overrides, and {len(all_methods)} total methods")
+        field_count = 0
+        method_override_chunks = []
+        method_chunks = []
+
+        python_files = [file_path for files in module_files for file_path in files['.py']]
+        py_results = _run_parse_tasks(_parse_py_worker, python_files, args.workers)
+        ingested = []
+        for partial_registry, fields, method_overrides, methods in chain.from_iterable(py_results):
+            ingested.append((partial_registry, fields))
+            field_count += len(fields)
+            method_override_chunks.append(method_overrides)
+            method_chunks.append(methods)
+        # Every file's models and inheritance are merged before any field is linked to its parent
+        registry.bulk_ingest(ingested)
+        # Flatten the per-file results with a single allocation each; the fields
+        # themselves are exported from the registry
+        all_method_overrides = list(chain.from_iterable(method_override_chunks))
+        all_methods = list(chain.from_iterable(method_chunks))
+
+        logger.info(f"Found {field_count} field definitions, {len(all_method_overrides)} method overrides, and {len(all_methods)} total methods")
 
         # Set manifest dependencies in registry for module priority calculation
         registry.set_manifest_dependencies(manifest_dependencies)
@@ -242,167 +481,64 @@ def main():
 
         # Parse XML files to extract field usage
         logger.info("Parsing XML files...")
-        field_usage = {}
-
-        for module_path in custom_module_paths:
-            try:
-                logger.info(f"Processing XML files in {module_path}")
-                if args.skip_problematic:
-                    # Use safer file filtering
-                    xml_files = get_safe_files(module_path, '.xml', exclude_patterns=['test_', 'demo_'])
-
-                    # Process files individually
-                    for file_path in xml_files:
-                        try:
-                            file_usage = parse_xml_files([file_path], registry)
-                            # Merge file usage with overall usage
-                            for field_key, usages in file_usage.items():
-                                if field_key not in field_usage:
-                                    field_usage[field_key] = []
-                                field_usage[field_key].extend(usages)
-                        except Exception as e:
-                            logger.error(f"Error processing XML file {file_path}: {e}")
-                            continue
-                else:
-                    # Process entire module
-                    module_usage = parse_xml_files(module_path, registry)
-                    # Merge module usage with overall usage
-                    for field_key, usages in module_usage.items():
-                        if field_key not in field_usage:
-                            field_usage[field_key] = []
-                        field_usage[field_key].extend(usages)
-            except Exception as e:
-                logger.error(f"Error processing XML files in module {module_path}: {e}")
-                logger.error(traceback.format_exc())
+        field_usage = defaultdict(list)
+
+        xml_files = [file_path for files in module_files for file_path in files['.xml']]
+        xml_results = _run_parse_tasks(_parse_xml_worker, xml_files, args.workers, registry=registry)
+        for batch_usage, views in xml_results:
+            registry.views.update(views)
+            # Merge batch usage with overall usage (keys are interned again after crossing processes)
+            for field_key, usages in batch_usage.items():
+                field_usage[sys.intern(field_key)].extend(usages)
+        # Downstream analysis checks membership, so don't let lookups insert keys
+        field_usage = dict(field_usage)
 
         logger.info(f"Found {len(field_usage)} unique field references in XML files")
 
-        # Export basic field definitions
-        # Collect all fields from registry after normalization to ensure correct root_module and is_extension
-        field_list = []
-        
         # Get eligible modules from config for is_eligible_module flag
-        eligible_modules = set(config.ELIGIBLE_MODULES_FOR_CORE) if config.ELIGIBLE_MODULES_FOR_CORE else set()
-        
-        for model_name, model_fields in registry.fields.items():
-            for field_name, fields_list in model_fields.items():
-                for field in fields_list:
-                    try:
-                        # Pass eligible_modules and field_usage to populate usage stats and eligible flag
-                        field_dict = field.to_dict(eligible_modules=eligible_modules, field_usage=field_usage)
-                        field_list.append(field_dict)
-                    except Exception as e:
-                        logger.error(f"Error converting field to dict: {e}")
-        
+        eligible_modules = config.ELIGIBLE_MODULES_FOR_CORE_SET
+        # Eligible modules given on the command line override the config for the optional analyses
+        cli_eligible_modules = args.eligible_modules
+
+        # Export basic field definitions
+        # Fields are taken from the registry after normalization to ensure correct root_module and is_extension.
+        # Rows are streamed into the CSV (columns follow FieldDefinition.to_dict() order); only the rows
+        # the module summary needs are kept in memory.
+        summary_fields = []
+        export_csv(_iter_field_dicts(registry, eligible_modules, field_usage, summary_fields),
+                   output_paths.fields_analysis)
+
         # Generate module summary for eligible modules
         try:
             logger.info("Generating module summary for eligible modules...")
-            generate_module_summary(output_dir, registry, field_list, all_methods, eligible_modules)
+            generate_module_summary(output_dir, registry, summary_fields, all_methods, eligible_modules)
         except Exception as e:
-            logger.error(f"Error generating module summary: {e}")
-            logger.error(traceback.format_exc())
-
-        if field_list:
-            # Ensure all fields have the same keys (handle cases where some fields might not have root_module set yet)
-            all_keys = set()
-            for field_dict in field_list:
-                all_keys.update(field_dict.keys())
-            # Use a consistent order - removed dependency_fields, added is_eligible_module and is_redundant_extension
-            field_keys = ['model', 'field_name', 'field_key', 'field_type', 'attributes', 'defined_in', 
-                         'module', 'root_module', 'root_model', 'extending_modules', 'is_eligible_module',
-                         'is_computed', 'is_stored', 'is_related', 
-                         'usage_count', 'used_in_modules', 'used_in_views', 
-                         'is_extension', 'extended_from', 'added_attributes', 'modified_attributes', 'removed_attributes',
-                         'is_redundant_extension']
-            # Only include keys that exist in the data
-            export_keys = [k for k in field_keys if k in all_keys]
-            export_csv(field_list, os.path.join(output_dir, 'fields_analysis.csv'), export_keys)
+            logger.error(f"Error generating module summary: {e}",
+                         exc_info=logger.isEnabledFor(logging.DEBUG))
 
         # Export method overrides
-        export_csv(all_method_overrides, os.path.join(output_dir, 'method_overrides.csv'),
+        export_csv(all_method_overrides, output_paths.method_overrides,
                    ['class', 'model', 'method', 'file_path', 'module'])
         
         # Export csl_* module models
         try:
-            export_csl_models(registry, output_dir, base_dir=config.BASE_DIR)
+            export_csl_models(registry, output_dir, base_dir=config.BASE_DIR, max_workers=args.workers)
         except Exception as e:
-            logger.error(f"Error exporting csl_* models: {e}")
-            logger.error(traceback.format_exc())
+            logger.error(f"Error exporting csl_* models: {e}",
+                         exc_info=logger.isEnabledFor(logging.DEBUG))
         
         # Export model inheritance relationships
-        inheritance_data = []
-        
-        # First, handle models with _name that inherit other models
-        for model_name, inherited_models in registry.inherits.items():
-            if model_name in registry.models:
-                model_module = registry.models[model_name].get('module', 'unknown')
-                for inherited_model in inherited_models:
-                    # Skip None values
-                    if not inherited_model:
-                        continue
-                    # Get inherited module - may not be in registry if it's a standard Odoo model
-                    inherited_module = 'unknown'
-                    if inherited_model and isinstance(inherited_model, str) and inherited_model in registry.models:
-                        inherited_module = registry.models[inherited_model].get('module', 'unknown')
-                    elif inherited_model and isinstance(inherited_model, str):
-                        # Infer from model name (e.g., "mail.thread" -> "mail", "product.template" -> "product")
-                        if '.' in inherited_model:
-                            model_prefix = inherited_model.split('.')[0]
-                            # Check if it's a known standard Odoo module
-                            if model_prefix in ['mail', 'product', 'sale', 'purchase', 'account', 'stock', 
-                                               'project', 'hr', 'base', 'web', 'portal', 'website']:
-                                inherited_module = model_prefix
-                    
-                    inheritance_data.append({
-                        'model': model_name,
-                        'module': model_module,
-                        'inherited_model': inherited_model,
-                        'inherited_module': inherited_module
-                    })
-        
-        # Also handle extension-only classes (no _name, just _inherit)
-        for module, extensions in registry.module_extensions.items():
-            for model_name, inherited_model in extensions:
-                # Skip None values
-                if not model_name or not inherited_model:
-                    continue
-                # Get inherited module - may not be in registry if it's a standard Odoo model
-                inherited_module = 'unknown'
-                if inherited_model and isinstance(inherited_model, str) and inherited_model in registry.models:
-                    inherited_module = registry.models[inherited_model].get('module', 'unknown')
-                elif inherited_model and isinstance(inherited_model, str):
-                    # Infer from model name
-                    if '.' in inherited_model:
-                        model_prefix = inherited_model.split('.')[0]
-                        if model_prefix in ['mail', 'product', 'sale', 'purchase', 'account', 'stock', 
-                                           'project', 'hr', 'base', 'web', 'portal', 'website']:
-                            inherited_module = model_prefix
-                
-                inheritance_data.append({
-                    'model': model_name,
-                    'module': module,
-                    'inherited_model': inherited_model,
-                    'inherited_module': inherited_module
-                })
-        
-        if inheritance_data:
-            export_csv(inheritance_data, os.path.join(output_dir, 'model_inheritance.csv'),
-                      ['model', 'module', 'inherited_model', 'inherited_module'])
-
-        # Export field usage
-        field_usage_list = []
-        for field_key, usages in field_usage.items():
-            for usage in usages:
-                field_usage_list.append(usage)
+        export_csv(_iter_inheritance_rows(registry), output_paths.model_inheritance)
 
-        if field_usage_list:
-            export_csv(field_usage_list, os.path.join(output_dir, 'field_usage.csv'),
-                       field_usage_list[0].keys())
+        # Export field usage; the per-key lists are chained rather than flattened into a new list
+        export_csv(chain.from_iterable(field_usage.values()), output_paths.field_usage)
 
         # Advanced analysis using ModuleAnalyzer
         if args.analyze_sharing or args.identify_core:
             try:
                 logger.info("Starting advanced analysis...")
+                # Optional analyses are imported only when requested to keep startup fast
+                from analysis.module_analyzer import ModuleAnalyzer
                 analyzer = ModuleAnalyzer(registry, field_usage, manifest_dependencies)
 
                 # Analyze field sharing across modules
@@ -410,7 +546,9 @@ def main():
                     try:
                         logger.info("Analyzing field sharing across modules...")
                         shared_fields = analyzer.analyze_field_sharing()
-                        export_csv(shared_fields, os.path.join(output_dir, 'shared_fields.csv'),
+                        # The modules using each field are kept as a set, and only formatted here
+                        export_csv(({**field_info, 'used_in_modules': format_module_set(field_info['used_in_modules'])}
+                                    for field_info in shared_fields), output_paths.shared_fields,
                                    ['field_key', 'model', 'field_name', 'used_in_modules', 'defined_in_module',
                                     'root_module', 'extending_modules', 'usage_count'])
                         
@@ -426,7 +564,7 @@ def main():
                                     field_dep_list.append(field_info)
                             
                             if field_dep_list:
-                                export_csv(field_dep_list, os.path.join(output_dir, 'field_dependencies.csv'),
+                                export_csv(field_dep_list, output_paths.field_dependencies,
                                           ['field_key', 'root_model', 'field_name', 'root_module', 
                                            'defined_in_module', 'extending_modules', 'is_extension',
                                            'field_type', 'used_in_modules', 'usage_count'])
@@ -441,36 +579,36 @@ def main():
                                 })
                             
                             if dep_summary:
-                                export_csv(dep_summary, os.path.join(output_dir, 'field_dependencies_summary.csv'),
+                                export_csv(dep_summary, output_paths.field_dependencies_summary,
                                           ['root_module', 'field_count', 'extending_modules'])
                         except Exception as e:
-                            logger.error(f"Error analyzing field dependencies: {e}")
-                            logger.error(traceback.format_exc())
+                            logger.error(f"Error analyzing field dependencies: {e}",
+                                         exc_info=logger.isEnabledFor(logging.DEBUG))
 
                         # Analyze view field usage
                         try:
                             view_analysis = analyzer.analyze_view_field_usage()
-                            export_csv(view_analysis, os.path.join(output_dir, 'view_field_analysis.csv'),
+                            export_csv(view_analysis, output_paths.view_field_analysis,
                                        ['field_key', 'view_modules', 'data_modules', 'shared_between',
                                         'recommendation'])
                         except Exception as e:
                             logger.error(f"Error analyzing view field usage: {e}")
                     except Exception as e:
-                        logger.error(f"Error analyzing field sharing: {e}")
-                        logger.error(traceback.format_exc())
+                        logger.error(f"Error analyzing field sharing: {e}",
+                                     exc_info=logger.isEnabledFor(logging.DEBUG))
 
                 # Identify fields that should be in core module
                 if args.identify_core:
                     try:
                         logger.info("Identifying fields that should be in core module...")
                         core_candidates = analyzer.identify_core_candidates()
-                        export_csv(core_candidates, os.path.join(output_dir, 'core_candidates.csv'),
+                        export_csv(core_candidates, output_paths.core_candidates,
                                    ['type', 'key', 'current_module', 'used_in', 'reason'])
 
                         # Analyze business logic methods
                         try:
                             shared_methods = analyzer.analyze_business_logic_methods(all_method_overrides)
-                            export_csv(shared_methods, os.path.join(output_dir, 'shared_methods.csv'),
+                            export_csv(shared_methods, output_paths.shared_methods,
                                        ['key', 'model', 'method', 'modules', 'recommendation'])
                         except Exception as e:
                             logger.error(f"Error analyzing shared methods: {e}")
@@ -478,44 +616,44 @@ def main():
                         # Identify utility method candidates
                         try:
                             utility_candidates = analyzer.identify_utility_candidates(all_method_overrides)
-                            export_csv(utility_candidates, os.path.join(output_dir, 'utility_candidates.csv'),
+                            export_csv(utility_candidates, output_paths.utility_candidates,
                                        ['key', 'model', 'method', 'module', 'file_path', 'reason'])
                         except Exception as e:
                             logger.error(f"Error identifying utility candidates: {e}")
                     except Exception as e:
-                        logger.error(f"Error identifying core candidates: {e}")
-                        logger.error(traceback.format_exc())
+                        logger.error(f"Error identifying core candidates: {e}",
+                                     exc_info=logger.isEnabledFor(logging.DEBUG))
             except Exception as e:
-                logger.error(f"Error in advanced analysis: {e}")
-                logger.error(traceback.format_exc())
+                logger.error(f"Error in advanced analysis: {e}",
+                             exc_info=logger.isEnabledFor(logging.DEBUG))
 
         # Generate restructuring recommendations if requested
         if args.generate_recommendations:
             try:
                 logger.info("Generating restructuring recommendations for csl_core...")
                 # Use command-line eligible modules if provided, otherwise use config/auto-detect
-                eligible_modules = args.eligible_modules
-                if eligible_modules:
-                    logger.info(f"Using specified eligible modules: {eligible_modules}")
-                generate_restructuring_recommendations(output_dir, output_dir, eligible_modules)
+                if cli_eligible_modules:
+                    logger.info(f"Using specified eligible modules: {cli_eligible_modules}")
+                from analysis.recommendations import generate_restructuring_recommendations
+                generate_restructuring_recommendations(output_dir, output_dir, cli_eligible_modules)
                 logger.info("Restructuring recommendations generated successfully")
             except Exception as e:
-                logger.error(f"Error generating recommendations: {e}")
-                logger.error(traceback.format_exc())
+                logger.error(f"Error generating recommendations: {e}",
+                             exc_info=logger.isEnabledFor(logging.DEBUG))
         
         # Analyze module consolidation opportunities if requested
         if args.analyze_consolidation:
             try:
                 logger.info("Analyzing module consolidation opportunities...")
                 # Use command-line eligible modules if provided, otherwise use config
-                eligible_modules = args.eligible_modules
-                if eligible_modules:
-                    logger.info(f"Using specified eligible modules for consolidation: {eligible_modules}")
-                analyze_module_consolidation(output_dir, output_dir, eligible_modules)
+                if cli_eligible_modules:
+                    logger.info(f"Using specified eligible modules for consolidation: {cli_eligible_modules}")
+                from analysis.module_consolidation import analyze_module_consolidation
+                analyze_module_consolidation(output_dir, output_dir, cli_eligible_modules)
                 logger.info("Module consolidation analysis completed successfully")
             except Exception as e:
-                logger.error(f"Error analyzing module consolidation: {e}")
-                logger.error(traceback.format_exc())
+                logger.error(f"Error analyzing module consolidation: {e}",
+                             exc_info=logger.isEnabledFor(logging.DEBUG))
         
         # Perform migration analysis if requested
         if args.analyze_migration:
@@ -524,32 +662,32 @@ def main():
                 logger.info("PERFORMING MIGRATION ANALYSIS")
                 logger.info("=" * 80)
                 # Use command-line eligible modules if provided, otherwise use config
-                eligible_modules = args.eligible_modules
-                if not eligible_modules:
-                    eligible_modules = config.ELIGIBLE_MODULES_FOR_CORE if config.ELIGIBLE_MODULES_FOR_CORE else []
+                migration_modules = cli_eligible_modules or config.ELIGIBLE_MODULES_FOR_CORE or []
                 
-                if eligible_modules:
-                    logger.info(f"Using eligible modules: {eligible_modules}")
+                if migration_modules:
+                    logger.info(f"Using eligible modules: {migration_modules}")
+                    from analysis.migration_analysis import analyze_migration
                     analyze_migration(
                         args.original_dir,
                         args.new_dir,
                         output_dir,
-                        eligible_modules
+                        migration_modules,
+                        args.common_dir,
+                        args.workers
                     )
                     logger.info("Migration analysis completed successfully")
                 else:
                     logger.warning("No eligible modules specified - skipping migration analysis")
             except Exception as e:
-                logger.error(f"Error performing migration analysis: {e}")
-                logger.error(traceback.format_exc())
+                logger.error(f"Error performing migration analysis: {e}",
+                             exc_info=logger.isEnabledFor(logging.DEBUG))
 
         # Report execution time
         elapsed_time = time.time() - start_time
         logger.info(f"Analysis completed in {elapsed_time:.2f} seconds. Results exported to {output_dir}")
         return 0
     except Exception as e:
-        logger.error(f"Unhandled exception in main: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Unhandled exception in main: {e}")
         return 1
 
 if __name__ == '__main__':
@@ -5,14 +5,25 @@ import ast
 import csv
 import logging
 import os
-from utils.file_utils import get_files, get_module_name
+import re
+from itertools import groupby
+from operator import itemgetter
+import config
+from parsers.python_parser import load_python_ast
+from utils import parse_cache
+from utils.file_utils import get_files, get_module_name, open_bytes
+from utils.worker_pool import create_worker_pool
 
 logger = logging.getLogger(__name__)
 
 
-class ModelExtractor(ast.NodeVisitor):
+# Fields of AST nodes that hold nested statements (or except handlers and match cases holding them)
+_STATEMENT_BLOCKS = ('body', 'handlers', 'cases', 'orelse', 'finalbody')
+
+
+class ModelExtractor:
     """
-    AST visitor to extract model definitions without registering them.
+    Extract model definitions from an AST without registering them.
     This allows us to capture ALL model definitions, including duplicates.
     """
     
@@ -20,12 +31,23 @@ class ModelExtractor(ast.NodeVisitor):
         self.file_path = file_path
         self.module = get_module_name(file_path)
         self.models = []  # List of (model_name, class_name, module, file_path)
+
+    def extract(self, tree):
+        """Process every class definition in the tree, including nested ones"""
+        # Classes are statements, so only statement blocks are searched (iteratively, in source
+        # order) and expressions such as method bodies' calls and arguments are never visited
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, ast.ClassDef):
+                self._process_class(node)
+            for block_name in reversed(_STATEMENT_BLOCKS):
+                block = getattr(node, block_name, None)
+                if isinstance(block, list):
+                    stack.extend(reversed(block))
     
-    def visit_ClassDef(self, node, depth=0):
-        """Process class definitions to identify Odoo models"""
-        if depth > 100:  # Safety limit
-            return
-        
+    def _process_class(self, node):
+        """Process a class definition to identify Odoo models"""
         # Check if this is an Odoo model
         model_name = None
         inherits = []
@@ -59,48 +81,82 @@ class ModelExtractor(ast.NodeVisitor):
             is_new_model = len(inherits) == 0 or model_name not in inherits
             if is_new_model:
                 self.models.append((model_name, node.name, self.module, self.file_path))
-        
-        # Continue with child nodes
-        self.generic_visit(node)
 
 
-def extract_models_from_files(base_dir):
+# Files without this token can't assign _name, so they can't define new models
+_NAME_TOKEN_RE = re.compile(rb'\b_name\b')
+
+# Number of files handed to a worker process at a time
+EXTRACT_CHUNK_SIZE = 32
+
+
+def _extract_models(file_path):
+    """Extract the model definitions of one Python file, raising on errors"""
+    # A byte scan is much cheaper than parsing, and only classes assigning _name create models
+    with open_bytes(file_path) as source:
+        if not _NAME_TOKEN_RE.search(source):
+            return []
+
+    tree = load_python_ast(file_path)
+    extractor = ModelExtractor(file_path)
+    extractor.extract(tree)
+    return extractor.models
+
+
+def _extract_one(file_path):
+    """
+    Extract the model definitions of one Python file, logging and skipping files that fail
+
+    The extracted models are kept in the on-disk parse cache, so unchanged files are
+    neither parsed nor visited again.
+    """
+    try:
+        # Module names can fall back to the base directory, so results depend on it
+        return parse_cache.cached(file_path, 'csl_models', _extract_models, context=config.BASE_DIR)
+    except Exception as e:
+        logger.warning(f"Error extracting models from {file_path}: {e}")
+        return []
+
+
+def _is_other_module(dir_path, filenames):
+    """Whether a directory is the root of a module that isn't a csl_* module"""
+    return '__manifest__.py' in filenames and not os.path.basename(dir_path).startswith('csl_')
+
+
+def extract_models_from_files(base_dir, max_workers=1):
     """
     Extract all model definitions from Python files in the directory.
     Returns a list of (model_name, class_name, module, file_path) tuples.
+
+    Args:
+        base_dir: Directory to search for Python files
+        max_workers: Number of worker processes parsing the files (1 = parse in-process)
     """
     all_models = []
-    python_files = list(get_files(base_dir, '.py'))
+    # Don't walk into modules other than csl_* ones
+    python_files = list(get_files(base_dir, '.py', prune=_is_other_module))
     
     logger.info(f"Extracting models from {len(python_files)} Python files...")
-    
-    for file_path in python_files:
-        if file_path.endswith('__manifest__.py'):
-            continue
-        
-        module = get_module_name(file_path)
-        
-        # Only process csl_* modules
-        if not module.startswith('csl_'):
-            continue
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                file_content = f.read()
-            
-            tree = ast.parse(file_content)
-            extractor = ModelExtractor(file_path)
-            extractor.visit(tree)
-            
-            all_models.extend(extractor.models)
-        
-        except Exception as e:
-            logger.warning(f"Error extracting models from {file_path}: {e}")
+
+    # Only process csl_* modules
+    csl_files = [file_path for file_path in python_files
+                 if not file_path.endswith('__manifest__.py') and get_module_name(file_path).startswith('csl_')]
+
+    max_workers = min(max_workers, -(-len(csl_files) // EXTRACT_CHUNK_SIZE))
+    if max_workers <= 1:
+        for file_path in csl_files:
+            all_models.extend(_extract_one(file_path))
+        return all_models
+
+    with create_worker_pool(max_workers) as executor:
+        # Results come back in file order so the output stays deterministic
+        for models in executor.map(_extract_one, csl_files, chunksize=EXTRACT_CHUNK_SIZE):
+            all_models.extend(models)
     
     return all_models
 
 
-def export_csl_models(registry, output_dir, base_dir=None):
+def export_csl_models(registry, output_dir, base_dir=None, max_workers=1):
     """
     Export models created by modules starting with 'csl_'
     
@@ -111,37 +167,26 @@ def export_csl_models(registry, output_dir, base_dir=None):
         registry: ModelRegistry instance (kept for API compatibility, not used for model discovery)
         output_dir: Directory to write the output file
         base_dir: Base directory to search for Python files (required for direct parsing)
+        max_workers: Number of worker processes parsing the files (1 = parse in-process)
     """
     logger.info("Exporting models from csl_* modules...")
     
+    # Models are kept as (model_name, class_name, module, file_path) tuples, the CSV column order
     if base_dir is None:
         logger.warning("base_dir not provided, falling back to registry data (may miss duplicate definitions)")
         # Fallback: use registry data (will only show last registered definition per model)
-        csl_models = []
-        for model_name, model_info in registry.models.items():
-            module = model_info.get('module', '')
-            if module.startswith('csl_'):
-                csl_models.append({
-                    'model_name': model_name,
-                    'class_name': model_info.get('class_name', ''),
-                    'module': module,
-                    'file_path': model_info.get('file_path', '')
-                })
+        csl_models = [
+            (model_name, model_info.get('class_name', ''), model_info.get('module', ''),
+             model_info.get('file_path', ''))
+            for model_name, model_info in registry.models.items()
+            if model_info.get('module', '').startswith('csl_')
+        ]
     else:
         # Parse files directly to capture all definitions
-        extracted_models = extract_models_from_files(base_dir)
-        
-        csl_models = []
-        for model_name, class_name, module, file_path in extracted_models:
-            csl_models.append({
-                'model_name': model_name,
-                'class_name': class_name,
-                'module': module,
-                'file_path': file_path
-            })
+        csl_models = extract_models_from_files(base_dir, max_workers)
     
     # Sort by model name, then by module (so duplicates are grouped together)
-    csl_models.sort(key=lambda x: (x['model_name'], x['module']))
+    csl_models.sort(key=itemgetter(0, 2))
     
     # Write to CSV
     output_file = os.path.join(output_dir, 'csl_models.csv')
@@ -150,16 +195,20 @@ def export_csl_models(registry, output_dir, base_dir=None):
     try:
         os.makedirs(output_dir, exist_ok=True)
         with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+            # The tuples are written as they are, without building a dict per row
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
             writer.writerows(csl_models)
-        unique_model_names = set(m['model_name'] for m in csl_models)
-        duplicate_models = {name: [m for m in csl_models if m['model_name'] == name] 
-                           for name in unique_model_names if len([m for m in csl_models if m['model_name'] == name]) > 1}
+        # The list is sorted by model name, so definitions of the same model are adjacent
+        definition_counts = {name: sum(1 for _ in models) for name, models in groupby(csl_models, key=itemgetter(0))}
+        unique_model_names = definition_counts.keys()
+        duplicate_models = [name for name, count in definition_counts.items() if count > 1]
         
         logger.info(f"Exported {len(csl_models)} model definitions from csl_* modules to {output_file}")
         logger.info(f"  Found {len(unique_model_names)} unique model names")
-        logger.info(f"  Found {len(duplicate_models)} models defined in multiple modules (duplicates): {sorted(duplicate_models.keys())}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("  Found %d models defined in multiple modules (duplicates): %s",
+                        len(duplicate_models), sorted(duplicate_models))
     except Exception as e:
         logger.error(f"Error exporting csl_* models to {output_file}: {e}")
         raise
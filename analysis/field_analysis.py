@@ -2,42 +2,40 @@
 
 def analyze_unused_fields(fields, field_usage):
     """Identify fields that have no usages"""
-    unused_fields = []
+    # Keys with at least one usage, so each field takes a single set lookup
+    used_keys = {field_key for field_key, usages in field_usage.items() if usages}
 
-    for field in fields:
-        if field.field_key not in field_usage or not field_usage[field.field_key]:
-            # No usages found
-            unused_fields.append(field)
-
-    return unused_fields
+    return [field for field in fields if field.field_key not in used_keys]
 
 def analyze_shared_fields(fields, field_usage):
     """Identify fields that are used across multiple modules"""
     shared_fields = []
+    # Modules using each field key, collected once per key instead of once per definition
+    modules_by_key = {}
 
     for field in fields:
-        if field.field_key not in field_usage:
+        field_key = field.field_key
+        if field_key not in field_usage:
             continue
 
         # Get unique modules using this field
-        using_modules = set()
-        for usage in field_usage[field.field_key]:
-            if 'module' in usage:
-                using_modules.add(usage['module'])
+        key_modules = modules_by_key.get(field_key)
+        if key_modules is None:
+            key_modules = modules_by_key[field_key] = frozenset(
+                usage['module'] for usage in field_usage[field_key] if 'module' in usage)
 
         # Remove the defining module from the count
-        if field.module in using_modules:
-            using_modules.remove(field.module)
+        using_modules = key_modules - {field.module}
 
         # If used in multiple other modules
-        if len(using_modules) > 0:
+        if using_modules:
             shared_fields.append({
                 'field': field.name,
-                'field_key': field.field_key,
+                'field_key': field_key,
                 'model': field.model,
                 'defined_in_module': field.module,
                 'used_in_modules': list(using_modules),
-                'usage_count': len(field_usage[field.field_key])
+                'usage_count': len(field_usage[field_key])
             })
 
     return shared_fields
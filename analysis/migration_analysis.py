@@ -2,16 +2,22 @@
 Migration Analysis Tool - Compares original and migrated codebases
 to identify missing fields, views, and field usage in views
 """
+import copy
 import csv
 import logging
 import os
 from collections import defaultdict
+from functools import partial
+from itertools import chain
 from pathlib import Path
 
+import config
 from models.registry import ModelRegistry
 from parsers.python_parser import parse_python_files
-from parsers.xml_parser import parse_xml_file, extract_view_definitions
-from utils.file_utils import get_module_name
+from parsers.xml_parser import create_xml_parser, parse_xml_file, extract_view_definitions
+from utils import parse_cache
+from utils.file_utils import get_files_by_extension, get_module_name
+from utils.worker_pool import create_worker_pool
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +25,7 @@ logger = logging.getLogger(__name__)
 class MigrationAnalyzer:
     """Analyzes migration differences between original and new codebases"""
     
-    def __init__(self, original_dir, new_dir, eligible_modules):
+    def __init__(self, original_dir, new_dir, eligible_modules, common_dir=None, max_workers=1):
         """
         Initialize the migration analyzer
         
@@ -27,19 +33,27 @@ class MigrationAnalyzer:
             original_dir: Path to original codebase (e.g., C:\\Odoo\\sh\\src\\user)
             new_dir: Path to new codebase (e.g., C:\\Cursor\\Odoo\\csl_addons\\odoo)
             eligible_modules: Set of eligible module names to analyze
+            common_dir: Optional path to modules both codebases share (e.g. the Odoo core addons).
+                        They are parsed once and skipped when walking either codebase.
+            max_workers: Number of worker processes; with 2 or more, both codebases are analyzed at the same time
         """
         self.original_dir = original_dir
         self.new_dir = new_dir
         self.eligible_modules = set(eligible_modules) if eligible_modules else set()
+        self.common_dir = common_dir
+        self.max_workers = max_workers
+
+        # Registry of the shared modules, copied as the starting registry of both codebases
+        self._shared_base_registry = None
+        self._common_files = []  # Python files of the shared modules
+        self._common_prefix = os.path.normcase(os.path.join(os.path.abspath(common_dir), '')) if common_dir else None
         
         # Data structures for original codebase
-        self.original_registry = ModelRegistry()
         self.original_fields = {}  # field_key -> field_info
         self.original_views = {}  # view_id -> view_info
         self.original_view_fields = defaultdict(set)  # (view_id, view_type) -> set of field_keys
         
         # Data structures for new codebase
-        self.new_registry = ModelRegistry()
         self.new_fields = {}  # field_key -> field_info
         self.new_views = {}  # view_id -> view_info
         self.new_view_fields = defaultdict(set)  # (view_id, view_type) -> set of field_keys
@@ -51,192 +65,73 @@ class MigrationAnalyzer:
         logger.info(f"Original codebase: {self.original_dir}")
         logger.info(f"New codebase: {self.new_dir}")
         logger.info(f"Eligible modules: {sorted(self.eligible_modules)}")
+        if self.common_dir:
+            logger.info(f"Shared modules: {self.common_dir}")
         logger.info("=" * 80)
-        
-        # Analyze original codebase
-        logger.info("\n" + "=" * 80)
-        logger.info("ANALYZING ORIGINAL CODEBASE")
-        logger.info("=" * 80)
-        self._analyze_codebase(self.original_dir, self.original_registry, 
-                              self.original_fields, self.original_views, 
-                              self.original_view_fields, "original")
-        
-        # Analyze new codebase
-        logger.info("\n" + "=" * 80)
-        logger.info("ANALYZING NEW CODEBASE")
-        logger.info("=" * 80)
-        self._analyze_codebase(self.new_dir, self.new_registry, 
-                              self.new_fields, self.new_views, 
-                              self.new_view_fields, "new")
+
+        # Parse the modules both codebases share once and start both registries from a copy
+        if self.common_dir:
+            logger.info("\n" + "=" * 80)
+            logger.info("ANALYZING SHARED MODULES")
+            logger.info("=" * 80)
+            self._parse_common_codebase()
+        common_args = (self._common_prefix, self._common_files)
+
+        if self.max_workers > 1:
+            # The codebases are independent, so each is analyzed in a worker process of its own
+            logger.info("\n" + "=" * 80)
+            logger.info("ANALYZING ORIGINAL AND NEW CODEBASES IN PARALLEL")
+            logger.info("=" * 80)
+            # Sending the registry to a worker pickles it, which copies it already
+            base_registry = ModelRegistry() if self._shared_base_registry is None else self._shared_base_registry
+            with create_worker_pool(2) as executor:
+                original_future = executor.submit(_analyze_codebase, self.original_dir, self.eligible_modules,
+                                                  base_registry, "original", *common_args)
+                new_future = executor.submit(_analyze_codebase, self.new_dir, self.eligible_modules,
+                                             base_registry, "new", *common_args)
+                original_result = original_future.result()
+                new_result = new_future.result()
+        else:
+            # Analyze original codebase
+            logger.info("\n" + "=" * 80)
+            logger.info("ANALYZING ORIGINAL CODEBASE")
+            logger.info("=" * 80)
+            original_result = _analyze_codebase(self.original_dir, self.eligible_modules, self._new_registry(),
+                                                "original", *common_args)
+
+            # Analyze new codebase
+            logger.info("\n" + "=" * 80)
+            logger.info("ANALYZING NEW CODEBASE")
+            logger.info("=" * 80)
+            new_result = _analyze_codebase(self.new_dir, self.eligible_modules, self._new_registry(),
+                                           "new", *common_args)
+
+        self.original_fields, self.original_views, self.original_view_fields = original_result
+        self.new_fields, self.new_views, self.new_view_fields = new_result
         
         # Compare and generate report
         logger.info("\n" + "=" * 80)
         logger.info("COMPARING CODEBASES")
         logger.info("=" * 80)
         return self._generate_comparison_report()
-    
-    def _analyze_codebase(self, base_dir, registry, fields_dict, views_dict, view_fields_dict, label):
-        """Analyze a single codebase"""
-        logger.info(f"Parsing Python files in {base_dir}...")
-        
-        # Parse Python files to get fields
-        all_fields = []
-        all_method_overrides = []
-        all_methods = []
-        
+
+    def _new_registry(self):
+        """Get the registry to start analyzing a codebase from: a copy of the shared modules' one"""
+        if self._shared_base_registry is None:
+            return ModelRegistry()
+        return copy.deepcopy(self._shared_base_registry)
+
+    def _parse_common_codebase(self):
+        """Parse the Python files of the shared modules into the shared base registry"""
+        logger.info(f"Parsing Python files in {self.common_dir}...")
+        self._common_files = get_files_by_extension(self.common_dir, ['.py'])['.py']
+        self._shared_base_registry = ModelRegistry()
         try:
-            fields, method_overrides, methods = parse_python_files(base_dir, registry)
-            all_fields.extend(fields)
-            all_method_overrides.extend(method_overrides)
-            all_methods.extend(methods)
+            parse_python_files(self._common_files, self._shared_base_registry)
         except Exception as e:
             logger.error(f"Error parsing Python files: {e}")
-        
-        logger.info(f"Found {len(all_fields)} fields, {len(all_method_overrides)} method overrides, {len(all_methods)} methods")
-        
-        # Normalize field keys
-        logger.info("Normalizing field keys...")
-        registry.normalize_field_keys()
-        
-        # Filter fields by eligible modules and store
-        for field in all_fields:
-            module = field.module
-            root_module = field.root_module if field.root_module else module
-            
-            if module in self.eligible_modules or root_module in self.eligible_modules:
-                field_key = field.field_key
-                fields_dict[field_key] = {
-                    'field_key': field_key,
-                    'model': field.model,
-                    'field_name': field.name,
-                    'field_type': field.field_type,
-                    'module': module,
-                    'root_module': root_module,
-                    'file_path': field.file_path,
-                    'is_extension': field.is_extension
-                }
-        
-        logger.info(f"Stored {len(fields_dict)} fields from eligible modules")
-        
-        # Parse XML files to get views and field usage
-        logger.info(f"Parsing XML files in {base_dir}...")
-        field_usage = {}
-        
-        try:
-            # Get all XML files
-            xml_files = []
-            for root, dirs, files in os.walk(base_dir):
-                for file in files:
-                    if file.endswith('.xml'):
-                        xml_files.append(os.path.join(root, file))
-            
-            logger.info(f"Found {len(xml_files)} XML files")
-            
-            # Process each XML file
-            for xml_file in xml_files:
-                try:
-                    module = get_module_name(xml_file)
-                    if module not in self.eligible_modules:
-                        continue
-                    
-                    # Extract views and field usage - parse_xml_file does both
-                    try:
-                        file_usage = parse_xml_file(xml_file, registry)
-                        for field_key, usages in file_usage.items():
-                            if field_key not in field_usage:
-                                field_usage[field_key] = []
-                            field_usage[field_key].extend(usages)
-                    except Exception as e:
-                        logger.debug(f"Error processing XML file {xml_file}: {e}")
-                        
-                except Exception as e:
-                    logger.debug(f"Error processing XML file {xml_file}: {e}")
-        
-        except Exception as e:
-            logger.error(f"Error parsing XML files: {e}")
-        
-        # Store views from eligible modules
-        for view_id, view_info in registry.views.items():
-            # Extract module from view_id (format: module.view_id)
-            if '.' in view_id:
-                module = view_id.split('.')[0]
-                if module in self.eligible_modules:
-                    views_dict[view_id] = {
-                        'view_id': view_id,
-                        'model': view_info.get('model', ''),
-                        'inherit_id': view_info.get('inherit_id', ''),
-                        'view_type': view_info.get('view_type', '')
-                    }
-        
-        logger.info(f"Stored {len(views_dict)} views from eligible modules")
-        
-        # Store field usage in views
-        # Note: parse_xml_file returns dicts, not FieldUsage objects
-        # Filter to only eligible modules
-        eligible_field_usage = {}
-        for field_key, usages in field_usage.items():
-            eligible_usages = []
-            for usage in usages:
-                usage_module = usage.get('module', '')
-                if usage_module in self.eligible_modules:
-                    eligible_usages.append(usage)
-            if eligible_usages:
-                eligible_field_usage[field_key] = eligible_usages
-        
-        for field_key, usages in eligible_field_usage.items():
-            for usage in usages:
-                # usage is a dict from to_dict()
-                record_type = usage.get('record_type', '')
-                if record_type == 'view':
-                    view_id = usage.get('context', '')
-                    if view_id:
-                        # Try to find view_id in views_dict (might need to check with/without module prefix)
-                        matched_view_id = None
-                        if view_id in views_dict:
-                            matched_view_id = view_id
-                        else:
-                            # Try to find by matching the end of the view_id (without module prefix)
-                            # e.g., "view_competitor_price" should match "module.view_competitor_price"
-                            view_id_without_prefix = view_id.split('.')[-1] if '.' in view_id else view_id
-                            for vid in views_dict.keys():
-                                vid_without_prefix = vid.split('.')[-1] if '.' in vid else vid
-                                if view_id_without_prefix == vid_without_prefix:
-                                    matched_view_id = vid
-                                    break
-                            # Also try reverse - if view_id has module prefix, try matching without it
-                            if not matched_view_id and '.' in view_id:
-                                view_id_base = view_id.split('.', 1)[1]
-                                if view_id_base in views_dict:
-                                    matched_view_id = view_id_base
-                                else:
-                                    # Try matching base name
-                                    for vid in views_dict.keys():
-                                        if vid.endswith(view_id_base) or view_id_base.endswith(vid.split('.')[-1]):
-                                            matched_view_id = vid
-                                            break
-                        
-                        if matched_view_id:
-                            # Get view_type from view definition or usage
-                            view_type = views_dict[matched_view_id].get('view_type', '') or usage.get('view_type', '')
-                            # Use tuple of (view_id, view_type) as key to separate different view types
-                            view_key = (matched_view_id, view_type)
-                            view_fields_dict[view_key].add(field_key)
-                            if 'view_competitor_price' in view_id.lower() or 'offering' in field_key.lower():
-                                logger.info(f"DEBUG: Associated field '{field_key}' with view '{matched_view_id}' type '{view_type}' (from context '{view_id}')")
-                        else:
-                            # Log unmatched view_id for debugging (especially for views we care about)
-                            if 'view_competitor_price' in view_id.lower():
-                                logger.warning(f"Could not match view_id '{view_id}' to any registered view. Available views: {list(views_dict.keys())[:20]}")
-                            else:
-                                logger.debug(f"Could not match view_id '{view_id}' to any registered view. Available views: {list(views_dict.keys())[:10]}")
-        
-        logger.info(f"Stored field usage for {len(view_fields_dict)} views")
-        
-        # Debug: Log some view field associations
-        if logger.isEnabledFor(logging.DEBUG):
-            for vid, fields in list(view_fields_dict.items())[:5]:
-                logger.debug(f"View '{vid}' has {len(fields)} fields: {list(fields)[:5]}")
-    
+        logger.info(f"Found {len(self._shared_base_registry.models)} models in {len(self._common_files)} shared files")
+
     def _generate_comparison_report(self):
         """Generate comparison report showing what's missing in new codebase"""
         logger.info("Generating comparison report...")
@@ -247,31 +142,35 @@ class MigrationAnalyzer:
             'missing_view_fields': []
         }
         
-        # Find missing fields
-        for field_key, field_info in self.original_fields.items():
-            if field_key not in self.new_fields:
-                report['missing_fields'].append({
-                    'field_key': field_key,
-                    'model': field_info['model'],
-                    'field_name': field_info['field_name'],
-                    'field_type': field_info['field_type'],
-                    'module': field_info['module'],
-                    'root_module': field_info['root_module'],
-                    'original_file': field_info['file_path'],
-                    'is_extension': field_info['is_extension']
-                })
+        # Find missing fields (in original order, with a single lookup per field)
+        new_fields = self.new_fields
+        report['missing_fields'] = [
+            {
+                'field_key': field_key,
+                'model': field_info['model'],
+                'field_name': field_info['field_name'],
+                'field_type': field_info['field_type'],
+                'module': field_info['module'],
+                'root_module': field_info['root_module'],
+                'original_file': field_info['file_path'],
+                'is_extension': field_info['is_extension']
+            }
+            for field_key, field_info in self.original_fields.items() if field_key not in new_fields
+        ]
         
         logger.info(f"Found {len(report['missing_fields'])} missing fields")
         
         # Find missing views
-        for view_id, view_info in self.original_views.items():
-            if view_id not in self.new_views:
-                report['missing_views'].append({
-                    'view_id': view_id,
-                    'model': view_info['model'],
-                    'inherit_id': view_info['inherit_id'],
-                    'view_type': view_info['view_type']
-                })
+        new_views = self.new_views
+        report['missing_views'] = [
+            {
+                'view_id': view_id,
+                'model': view_info['model'],
+                'inherit_id': view_info['inherit_id'],
+                'view_type': view_info['view_type']
+            }
+            for view_id, view_info in self.original_views.items() if view_id not in new_views
+        ]
         
         logger.info(f"Found {len(report['missing_views'])} missing views")
         
@@ -317,7 +216,7 @@ class MigrationAnalyzer:
                         new_vid_base = new_vid.split('.')[-1] if '.' in new_vid else new_vid
                         if view_base == new_vid_base:
                             matched_new_view_id = new_vid
-                            logger.debug(f"Matched view '{view_id}' to '{matched_new_view_id}' by base name")
+                            logger.debug("Matched view '%s' to '%s' by base name", view_id, matched_new_view_id)
                             break
                 
                 # Now find matching view_key with same view_type
@@ -333,13 +232,6 @@ class MigrationAnalyzer:
                 new_fields = self.new_view_fields.get(matched_new_view_key, set())
                 missing = field_keys - new_fields
                 
-                # Debug logging for specific view
-                if 'view_competitor_price' in view_id.lower():
-                    logger.info(f"DEBUG: Checking view '{view_id}' type '{view_type}' (matched to '{matched_new_view_id}')")
-                    logger.info(f"DEBUG: Original fields: {sorted(field_keys)}")
-                    logger.info(f"DEBUG: New fields: {sorted(new_fields)}")
-                    logger.info(f"DEBUG: Missing fields: {sorted(missing)}")
-                
                 # Also try matching field_keys by field name only (in case model names differ)
                 if missing:
                     # Create a set of just field names from new_fields
@@ -348,7 +240,8 @@ class MigrationAnalyzer:
                         field_name = field_key.split('.')[-1] if '.' in field_key else field_key
                         if field_name in new_field_names:
                             # Field exists but with different model prefix - might be OK, but log it
-                            logger.debug(f"Field '{field_name}' in view '{view_id}' type '{view_type}' has different model prefix in new codebase")
+                            logger.debug("Field '%s' in view '%s' type '%s' has different model prefix in new codebase",
+                                         field_name, view_id, view_type)
                             missing.remove(field_key)
                 
                 for field_key in missing:
@@ -383,10 +276,11 @@ class MigrationAnalyzer:
         logger.info(f"Found {len(report['missing_view_fields'])} missing field references in views")
         
         # Debug: Log some examples
-        if report['missing_view_fields']:
-            logger.info(f"Sample missing view fields (first 5):")
+        if report['missing_view_fields'] and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sample missing view fields (first 5):")
             for item in report['missing_view_fields'][:5]:
-                logger.info(f"  View '{item['view_id']}': missing field '{item['field_name']}' (key: {item['field_key']})")
+                logger.debug("  View '%s': missing field '%s' (key: %s)",
+                             item['view_id'], item['field_name'], item['field_key'])
         
         return report
     
@@ -403,8 +297,7 @@ class MigrationAnalyzer:
                 with open(output_file, 'w', newline='', encoding='utf-8') as f:
                     writer = csv.DictWriter(f, fieldnames=fieldnames)
                     writer.writeheader()
-                    for row in report['missing_fields']:
-                        writer.writerow(row)
+                    writer.writerows(report['missing_fields'])
                 logger.info(f"Exported {len(report['missing_fields'])} missing fields to {output_file}")
             except Exception as e:
                 logger.error(f"Error exporting missing fields: {e}")
@@ -417,8 +310,7 @@ class MigrationAnalyzer:
                 with open(output_file, 'w', newline='', encoding='utf-8') as f:
                     writer = csv.DictWriter(f, fieldnames=fieldnames)
                     writer.writeheader()
-                    for row in report['missing_views']:
-                        writer.writerow(row)
+                    writer.writerows(report['missing_views'])
                 logger.info(f"Exported {len(report['missing_views'])} missing views to {output_file}")
             except Exception as e:
                 logger.error(f"Error exporting missing views: {e}")
@@ -429,13 +321,10 @@ class MigrationAnalyzer:
             fieldnames = ['view_id', 'view_type', 'matched_new_view_id', 'model', 'field_key', 'field_name', 'module', 'note']
             try:
                 with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    # restval fills in the note for rows that don't have one
+                    writer = csv.DictWriter(f, fieldnames=fieldnames, restval='')
                     writer.writeheader()
-                    for row in report['missing_view_fields']:
-                        # Ensure note field exists
-                        if 'note' not in row:
-                            row['note'] = ''
-                        writer.writerow(row)
+                    writer.writerows(report['missing_view_fields'])
                 logger.info(f"Exported {len(report['missing_view_fields'])} missing view fields to {output_file}")
             except Exception as e:
                 logger.error(f"Error exporting missing view fields: {e}")
@@ -473,7 +362,229 @@ class MigrationAnalyzer:
             logger.error(f"Error writing summary report: {e}")
 
 
-def analyze_migration(original_dir, new_dir, output_dir, eligible_modules):
+def _is_common_dir(common_prefix, dir_path, filenames):
+    """Check if a directory belongs to the shared modules (prune callback for the codebase walk)"""
+    return os.path.normcase(os.path.join(os.path.abspath(dir_path), '')).startswith(common_prefix)
+
+
+def _analyze_codebase(base_dir, eligible_modules, registry, label, common_prefix=None, common_files=()):
+    """
+    Analyze a single codebase, reusing the cached results if none of its files changed
+
+    Args:
+        base_dir: Path to the codebase
+        eligible_modules: Set of eligible module names to analyze
+        registry: ModelRegistry to parse the codebase into, may hold the shared modules already
+        label: Name of the codebase in log messages ("original" or "new")
+        common_prefix: Normalized path prefix of the shared modules to skip, if any
+        common_files: Python files of the shared modules parsed into the registry
+
+    Returns:
+        tuple: (fields_dict, views_dict, view_fields_dict) with field_key -> field_info,
+               view_id -> view_info and (view_id, view_type) -> set of field_keys
+    """
+    logger.info(f"Parsing Python files in {base_dir}...")
+    fields_dict = {}
+    views_dict = {}
+    view_fields_dict = defaultdict(set)
+
+    # Parse Python files to get fields
+    all_fields = []
+    all_method_overrides = []
+    all_methods = []
+
+    # Walk the codebase once for both the Python and the XML files, skipping the shared modules
+    files_by_extension = get_files_by_extension(base_dir, ['.py', '.xml'],
+                                                prune=partial(_is_common_dir, common_prefix) if common_prefix else None)
+
+    # Reuse the previous results if no file of the codebase (or of the shared modules) changed since
+    try:
+        tree_key = parse_cache.tree_key(chain(chain.from_iterable(files_by_extension.values()),
+                                              common_files))
+    except OSError as e:
+        logger.debug("Not caching the analysis of %s: %s", base_dir, e)
+        tree_key = None
+    # Module names can fall back to the base directory, and only eligible modules are kept
+    cache_context = (config.BASE_DIR, tuple(sorted(eligible_modules)))
+    if tree_key:
+        cached_result = parse_cache.get_tree(base_dir, 'migration', tree_key, cache_context)
+        if cached_result is not None:
+            fields_dict, views_dict, view_fields_dict = cached_result
+            logger.info(f"Loaded unchanged {label} codebase from cache: {len(fields_dict)} fields, "
+                        f"{len(views_dict)} views, field usage for {len(view_fields_dict)} views")
+            return cached_result
+
+    try:
+        fields, method_overrides, methods = parse_python_files(files_by_extension['.py'], registry)
+        all_fields.extend(fields)
+        all_method_overrides.extend(method_overrides)
+        all_methods.extend(methods)
+    except Exception as e:
+        logger.error(f"Error parsing Python files: {e}")
+
+    logger.info(f"Found {len(all_fields)} fields, {len(all_method_overrides)} method overrides, {len(all_methods)} methods")
+
+    # Normalize field keys
+    logger.info("Normalizing field keys...")
+    registry.normalize_field_keys()
+
+    # Filter fields by eligible modules and store
+    for field in all_fields:
+        module = field.module
+        root_module = field.root_module if field.root_module else module
+
+        if module in eligible_modules or root_module in eligible_modules:
+            field_key = field.field_key
+            fields_dict[field_key] = {
+                'field_key': field_key,
+                'model': field.model,
+                'field_name': field.name,
+                'field_type': field.field_type,
+                'module': module,
+                'root_module': root_module,
+                'file_path': field.file_path,
+                'is_extension': field.is_extension
+            }
+
+    logger.info(f"Stored {len(fields_dict)} fields from eligible modules")
+
+    # Parse XML files to get views and field usage
+    logger.info(f"Parsing XML files in {base_dir}...")
+    field_usage = defaultdict(list)
+
+    try:
+        xml_files = files_by_extension['.xml']
+
+        logger.info(f"Found {len(xml_files)} XML files")
+
+        # One parser instance is reused for the whole codebase
+        parser = create_xml_parser()
+
+        # Process each XML file
+        for xml_file in xml_files:
+            try:
+                module = get_module_name(xml_file)
+                if module not in eligible_modules:
+                    continue
+
+                # Extract views and field usage - parse_xml_file does both
+                try:
+                    file_usage = parse_xml_file(xml_file, registry, parser)
+                    for field_key, usages in file_usage.items():
+                        field_usage[field_key].extend(usages)
+                except Exception as e:
+                    logger.debug("Error processing XML file %s: %s", xml_file, e)
+
+            except Exception as e:
+                logger.debug("Error processing XML file %s: %s", xml_file, e)
+
+    except Exception as e:
+        logger.error(f"Error parsing XML files: {e}")
+
+    # Store views from eligible modules
+    for view_id, view_info in registry.views.items():
+        # Extract module from view_id (format: module.view_id)
+        if '.' in view_id:
+            module = view_id.split('.')[0]
+            if module in eligible_modules:
+                views_dict[view_id] = {
+                    'view_id': view_id,
+                    'model': view_info.get('model', ''),
+                    'inherit_id': view_info.get('inherit_id', ''),
+                    'view_type': view_info.get('view_type', '')
+                }
+
+    logger.info(f"Stored {len(views_dict)} views from eligible modules")
+
+    # Store field usage in views
+    # Note: parse_xml_file returns dicts, not FieldUsage objects
+    # Filter to only eligible modules
+    eligible_field_usage = {}
+    for field_key, usages in field_usage.items():
+        eligible_usages = []
+        for usage in usages:
+            usage_module = usage.get('module', '')
+            if usage_module in eligible_modules:
+                eligible_usages.append(usage)
+        if eligible_usages:
+            eligible_field_usage[field_key] = eligible_usages
+
+    # Index views by their ID without module prefix (first view wins, as a scan in order would)
+    views_by_name = {}
+    for vid in views_dict:
+        views_by_name.setdefault(vid.rpartition('.')[2], vid)
+    # Many usages reference the same view, so each view_id is matched only once
+    # (might need to check with/without module prefix)
+    view_contexts = {usage.get('context', '')
+                     for usages in eligible_field_usage.values()
+                     for usage in usages if usage.get('record_type', '') == 'view'}
+    view_contexts.discard('')
+    matched_view_ids = {}
+    for view_id in view_contexts:
+        matched_view_id = matched_view_ids[view_id] = _match_view_id(view_id, views_dict, views_by_name)
+        if not matched_view_id and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Could not match view_id '{view_id}' to any registered view. Available views: {list(views_dict.keys())[:10]}")
+
+    # Pair each field with the (view_id, view_type) it is used in; the view_type comes from the
+    # view definition or the usage, keeping different view types apart
+    view_field_pairs = [
+        ((matched_view_id, views_dict[matched_view_id].get('view_type', '') or usage.get('view_type', '')), field_key)
+        for field_key, usages in eligible_field_usage.items()
+        for usage in usages if usage.get('record_type', '') == 'view'
+        for matched_view_id in (matched_view_ids.get(usage.get('context', '')),) if matched_view_id
+    ]
+    for view_key, field_key in view_field_pairs:
+        view_fields_dict[view_key].add(field_key)
+
+    logger.info(f"Stored field usage for {len(view_fields_dict)} views")
+
+    # Debug: Log some view field associations
+    if logger.isEnabledFor(logging.DEBUG):
+        for vid, fields in list(view_fields_dict.items())[:5]:
+            logger.debug("View '%s' has %d fields: %s", vid, len(fields), list(fields)[:5])
+
+    result = (fields_dict, views_dict, dict(view_fields_dict))
+    if tree_key:
+        parse_cache.put_tree(base_dir, 'migration', result, tree_key, cache_context)
+    return result
+
+
+
+def _match_view_id(view_id, views_dict, views_by_name):
+    """
+    Find the view in views_dict a view_id from a field usage refers to
+
+    Args:
+        view_id: View ID from the usage context, with or without module prefix
+        views_dict: Dictionary of view_id -> view info
+        views_by_name: Dictionary of view ID without module prefix -> first such view_id in views_dict
+
+    Returns:
+        str: Matching view_id in views_dict, or None
+    """
+    if view_id in views_dict:
+        return view_id
+
+    # Try to find by matching the end of the view_id (without module prefix)
+    # e.g., "view_competitor_price" should match "module.view_competitor_price"
+    matched_view_id = views_by_name.get(view_id.rpartition('.')[2])
+    if matched_view_id:
+        return matched_view_id
+
+    # Also try reverse - if view_id has module prefix, try matching without it
+    if '.' in view_id:
+        view_id_base = view_id.split('.', 1)[1]
+        if view_id_base in views_dict:
+            return view_id_base
+        # Try matching base name
+        for vid in views_dict:
+            if vid.endswith(view_id_base) or view_id_base.endswith(vid.rpartition('.')[2]):
+                return vid
+
+    return None
+
+
+def analyze_migration(original_dir, new_dir, output_dir, eligible_modules, common_dir=None, max_workers=1):
     """
     Main function to analyze migration differences
     
@@ -482,9 +593,10 @@ def analyze_migration(original_dir, new_dir, output_dir, eligible_modules):
         new_dir: Path to new codebase
         output_dir: Directory to write output files
         eligible_modules: List of eligible module names
+        common_dir: Optional path to modules both codebases share, parsed only once
+        max_workers: Number of worker processes (2 or more analyzes both codebases at the same time)
     """
-    analyzer = MigrationAnalyzer(original_dir, new_dir, eligible_modules)
+    analyzer = MigrationAnalyzer(original_dir, new_dir, eligible_modules, common_dir, max_workers)
     report = analyzer.analyze()
     analyzer.export_report(output_dir, report)
     return report
-
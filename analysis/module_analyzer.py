@@ -1,12 +1,20 @@
 """Module analyzer for field sharing and reorganization"""
 import logging
-import csv
 import os
+import re
+import sys
 from collections import defaultdict
+from operator import itemgetter
 from pathlib import Path
+from exporters.csv_exporter import write_csv_rows
+from models.field import format_module_set
 
 logger = logging.getLogger(__name__)
 
+# Method names containing any of these words suggest utility functions, matched in one case-insensitive scan
+UTILITY_KEYWORDS = ('get', 'compute', 'calculate', 'format', 'validate', 'check', 'helper', 'util')
+_UTILITY_NAME_RE = re.compile('|'.join(UTILITY_KEYWORDS), re.IGNORECASE)
+
 class ModuleAnalyzer:
     """
     Analyzes module structure and field usage to identify candidates for reorganization
@@ -17,6 +25,10 @@ class ModuleAnalyzer:
         self.field_usage = field_usage
         self.manifest_dependencies = manifest_dependencies
         self.field_to_modules = defaultdict(set)
+        # field_key -> modules using it in views / data records, filled in by _scan_field_usage()
+        self._view_fields = None
+        self._data_fields = None
+        self._view_analysis = None  # Result of analyze_view_field_usage()
         self.shared_fields = []
         self.core_candidates = []
         self.module_dependencies = self._build_module_dependency_graph()
@@ -24,30 +36,56 @@ class ModuleAnalyzer:
     def _build_module_dependency_graph(self):
         """Build module dependency graph from manifest dependencies"""
         dependencies = defaultdict(set)
+        # Module names come back from parser workers as separate copies, so they are interned again
         for module_info in self.manifest_dependencies:
-            module = module_info['module']
-            for dep in module_info.get('dependencies', []):
-                dependencies[module].add(dep)
+            deps = module_info.get('dependencies', [])
+            if deps:
+                dependencies[sys.intern(module_info['module'])].update(map(sys.intern, deps))
         return dependencies
 
+    def _scan_field_usage(self):
+        """
+        Group the modules using each field key in a single pass over the field usage
+
+        Fills in field_to_modules with all modules using a field, and the modules using it
+        in views and in data records for analyze_view_field_usage().
+        """
+        if self._view_fields is not None:
+            return
+
+        view_fields = {}
+        data_fields = {}
+        get_module = itemgetter('module')
+        # Usages come back from parser workers with their own copies of the module names, so the
+        # names are interned again: the sets then share one string per module and compare by identity
+        intern = sys.intern
+        for field_key, usages in self.field_usage.items():
+            # The modules are fetched and collected in C, without a Python-level loop
+            self.field_to_modules[field_key] = set(map(intern, map(get_module, usages)))
+
+            view_modules = {intern(usage['module']) for usage in usages if usage.get('record_type') == 'view'}
+            if view_modules:
+                view_fields[field_key] = view_modules
+            data_modules = {intern(usage['module']) for usage in usages if usage.get('record_type') == 'data'}
+            if data_modules:
+                data_fields[field_key] = data_modules
+
+        self._view_fields = view_fields
+        self._data_fields = data_fields
+
     def analyze_field_sharing(self):
         """Analyze field usage to identify shared fields across modules"""
         logger.info("Analyzing field sharing across modules...")
 
         # Build field to modules mapping
+        self._scan_field_usage()
         for field_key, usages in self.field_usage.items():
-            modules = set()
-            for usage in usages:
-                modules.add(usage['module'])
-
-            self.field_to_modules[field_key] = modules
+            modules = self.field_to_modules[field_key]
 
             # Fields used in multiple modules are shared
             if len(modules) > 1:
-                field_parts = field_key.split('.')
-                if len(field_parts) >= 2:  # Ensure it's a valid field_key with model.field_name
-                    model = '.'.join(field_parts[:-1])
-                    field_name = field_parts[-1]
+                if '.' in field_key:  # Ensure it's a valid field_key with model.field_name
+                    model, field_name = field_key.rsplit('.', 1)
 
                     # Find the field definition for additional info
                     field_def = self.registry.get_field(model, field_name)
@@ -64,7 +102,7 @@ class ModuleAnalyzer:
                         'field_key': field_key,
                         'model': model,
                         'field_name': field_name,
-                        'used_in_modules': ', '.join(modules),
+                        'used_in_modules': modules,  # Formatted when exported
                         'defined_in_module': defined_module,
                         'root_module': root_module,
                         'extending_modules': extending_modules,
@@ -127,28 +165,37 @@ class ModuleAnalyzer:
         logger.info("Identifying candidates for core module...")
 
         # First, find fields defined in one module but used in multiple modules
+        field_candidates = []  # (model, candidate) pairs
+        # Field candidates by model, so a model's candidates are found without scanning them all
+        candidates_by_model = defaultdict(list)
         for field_info in self.shared_fields:
             field_key = field_info['field_key']
             defined_module = field_info['defined_in_module']
-            used_modules = set(field_info['used_in_modules'].split(', '))
+            used_modules = field_info['used_in_modules']
 
             # If field is defined in one module but used in others, it's a candidate for core
             if defined_module != "unknown" and defined_module in used_modules and len(used_modules) > 1:
-                self.core_candidates.append({
+                candidate = {
                     'type': 'field',
                     'key': field_key,
                     'current_module': defined_module,
                     'used_in': ', '.join(used_modules),
                     'reason': 'Used in multiple modules'
-                })
+                }
+                model = field_key.rsplit('.', 1)[0]
+                field_candidates.append((model, candidate))
+                candidates_by_model[model].append(candidate)
 
         # Also check for models that should be entirely in core
+        candidate_keys = {candidate['key'] for _, candidate in field_candidates}
         core_models = set()
+        model_candidates = []
         for model, fields in self.registry.fields.items():
             # If all fields of a model are candidates for core, the whole model could move
             if len(fields) > 1:
-                model_field_keys = {f"{model}.{field.name}" for field in fields.values()}
-                candidate_keys = {c['key'] for c in self.core_candidates if c['type'] == 'field'}
+                # The fields are keyed by name, so the keys are built from one prefix per model
+                prefix = model + '.'
+                model_field_keys = {prefix + field_name for field_name in fields}
 
                 if model_field_keys.issubset(candidate_keys):
                     # All fields are candidates, so consider moving the whole model
@@ -158,38 +205,30 @@ class ModuleAnalyzer:
                         module = model_info['module']
                         core_models.add(model)
 
-                        self.core_candidates.append({
+                        model_candidates.append({
                             'type': 'model',
                             'key': model,
                             'current_module': module,
-                            'used_in': ', '.join({c['used_in'] for c in self.core_candidates
-                                                  if c['type'] == 'field' and c['key'].startswith(f"{model}.")}),
+                            'used_in': ', '.join({c['used_in'] for c in candidates_by_model[model]}),
                             'reason': 'All fields used in multiple modules'
                         })
 
         # Remove field candidates for models that we're moving entirely
-        self.core_candidates = [c for c in self.core_candidates
-                                if c['type'] != 'field' or
-                                not any(c['key'].startswith(f"{model}.") for model in core_models)]
+        self.core_candidates.extend(candidate for model, candidate in field_candidates if model not in core_models)
+        self.core_candidates.extend(model_candidates)
 
         logger.info(f"Identified {len(self.core_candidates)} candidates for core module")
         return self.core_candidates
 
     def analyze_view_field_usage(self):
-        """Analyze field usage in views vs data records"""
-        view_fields = defaultdict(set)
-        data_fields = defaultdict(set)
+        """Analyze field usage in views vs data records (computed once, export_analysis() reuses it)"""
+        if self._view_analysis is not None:
+            return self._view_analysis
 
         # Group field usage by record type
-        for field_key, usages in self.field_usage.items():
-            for usage in usages:
-                module = usage['module']
-                record_type = usage.get('record_type', 'unknown')
-
-                if record_type == 'view':
-                    view_fields[field_key].add(module)
-                elif record_type == 'data':
-                    data_fields[field_key].add(module)
+        self._scan_field_usage()
+        view_fields = self._view_fields
+        data_fields = self._data_fields
 
         # Find fields used in views in one module but as data in others
         analysis = []
@@ -216,27 +255,26 @@ class ModuleAnalyzer:
                 })
 
         logger.info(f"Analyzed {len(analysis)} fields used in views across modules")
+        self._view_analysis = analysis
         return analysis
 
     def analyze_business_logic_methods(self, method_overrides):
         """Analyze business logic methods to identify shared functionality"""
-        # Group methods by name and model
+        # Group methods by name and model, keyed by (model, method) so the key is only formatted
+        # for the methods that are reported
         method_groups = defaultdict(list)
+        get_key = itemgetter('model', 'method')
         for method in method_overrides:
-            key = f"{method['model']}.{method['method']}"
-            method_groups[key].append(method)
+            method_groups[get_key(method)].append(method)
 
         # Find methods implemented in multiple modules
         shared_methods = []
-        for key, methods in method_groups.items():
+        for (model, method_name), methods in method_groups.items():
             if len(methods) > 1:
                 modules = {m['module'] for m in methods}
                 if len(modules) > 1:
-                    model = methods[0]['model']
-                    method_name = methods[0]['method']
-
                     shared_methods.append({
-                        'key': key,
+                        'key': f"{model}.{method_name}",
                         'model': model,
                         'method': method_name,
                         'modules': ', '.join(modules),
@@ -251,13 +289,13 @@ class ModuleAnalyzer:
         utility_candidates = []
 
         # Look for methods with generic names suggesting utility functions
-        utility_keywords = ['get', 'compute', 'calculate', 'format', 'validate', 'check', 'helper', 'util']
+        is_utility_name = _UTILITY_NAME_RE.search
 
         for method in method_overrides:
             method_name = method['method']
 
             # Check if the method name suggests a utility function
-            if any(keyword in method_name.lower() for keyword in utility_keywords):
+            if is_utility_name(method_name):
                 # Further analyze to see if it's standalone (few dependencies)
                 utility_candidates.append({
                     'key': f"{method['model']}.{method_name}",
@@ -276,9 +314,11 @@ class ModuleAnalyzer:
         os.makedirs(output_dir, exist_ok=True)
 
         # Export shared fields
+        # The modules using each field are kept as a set, and only formatted here
         self.export_to_csv(
             os.path.join(output_dir, "shared_fields.csv"),
-            self.shared_fields,
+            ({**field_info, 'used_in_modules': format_module_set(field_info['used_in_modules'])}
+             for field_info in self.shared_fields),
             ['field_key', 'model', 'field_name', 'used_in_modules', 'defined_in_module', 'usage_count']
         )
 
@@ -301,11 +341,5 @@ class ModuleAnalyzer:
 
     @staticmethod
     def export_to_csv(file_path, data, fieldnames):
-        """Export data to CSV file"""
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in data:
-                # Ensure all fields are present
-                row_dict = {field: row.get(field, '') for field in fieldnames}
-                writer.writerow(row_dict)
\ No newline at end of file
+        """Export data to CSV file, streaming the rows"""
+        write_csv_rows(file_path, fieldnames, data)
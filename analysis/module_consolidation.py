@@ -4,12 +4,22 @@ Module consolidation analysis to recommend which modules should be combined
 import csv
 import os
 import logging
-from collections import defaultdict
+import re
+from collections import Counter, defaultdict
+from operator import itemgetter
 from pathlib import Path
 import config
+from exporters.csv_exporter import write_csv_rows
+from parsers.xml_parser import ET
+from utils.file_utils import open_bytes
 
 logger = logging.getLogger(__name__)
 
+_EMPTY = frozenset()
+
+# View model attribute in XML files, with either quote style
+_VIEW_MODEL_RE = re.compile(rb'model=(["\'])ir\.ui\.view\1')
+
 
 class ModuleConsolidationAnalyzer:
     """
@@ -22,56 +32,116 @@ class ModuleConsolidationAnalyzer:
     
     def __init__(self, analysis_results_dir, eligible_modules=None):
         self.analysis_results_dir = analysis_results_dir
-        self.method_overrides = []
-        self.fields_data = []
-        self.module_dependencies = []
-        self.model_inheritance = []  # Direct inheritance relationships from CSV
+        self._dependency_pairs = set()  # frozensets of the two modules of each dependency
         self.inheritance_data = {}  # Will be populated from model_inheritance
+
+        # Aggregates of the method override and field rows, built while loading them (eligible modules only)
+        self._method_files = defaultdict(lambda: defaultdict(set))  # (model, method) -> module -> set of file paths
+        self._module_methods = {}  # module -> frozenset of (model, method) it overrides
+        self._module_models = defaultdict(set)  # module -> set of models it overrides methods of or defines fields for
+        self._method_override_counts = Counter()  # module -> number of method overrides
+        self._field_counts = Counter()  # module -> number of field definitions
+
+        # Module paths and file statistics, computed on first use
+        self._module_path_index = {}  # base directory -> module name -> list of module paths
+        self._module_file_counts = {}  # module path -> (python files, XML files, lines of code)
+        self._module_view_counts = {}  # module path -> number of views
         
         # Determine eligible modules
         if eligible_modules is not None:
             self.eligible_modules = set(eligible_modules)
         else:
-            self.eligible_modules = set(config.ELIGIBLE_MODULES_FOR_CORE) if config.ELIGIBLE_MODULES_FOR_CORE else set()
+            self.eligible_modules = config.ELIGIBLE_MODULES_FOR_CORE_SET
         
         if self.eligible_modules:
             logger.info(f"Consolidation analysis will only consider eligible modules: {sorted(self.eligible_modules)}")
         else:
             logger.warning("No eligible modules specified - consolidation analysis will consider all modules")
+
+    def _is_considered(self, module):
+        """Check if a module is considered by the analysis: any module if there are no eligible modules"""
+        return not self.eligible_modules or module in self.eligible_modules
+
+    def _iter_csv_rows(self, file_name, columns):
+        """
+        Yield the values of some columns of the rows of a CSV file of the analysis results, one row at a time
+
+        Rows are read positionally, without building a dictionary per row. Columns the file doesn't
+        have are blank, and nothing is yielded if it doesn't exist.
+
+        Args:
+            file_name: Name of the CSV file in the analysis results directory
+            columns: Names of the columns to yield, at least two
+        """
+        csv_path = os.path.join(self.analysis_results_dir, file_name)
+        if not os.path.exists(csv_path):
+            return
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            width = len(header)
+            positions = {name: i for i, name in enumerate(header)}
+            get_values = itemgetter(*[positions.get(column, width) for column in columns])
+            for row in reader:
+                if not row:
+                    continue
+                try:
+                    yield get_values(row)
+                except IndexError:
+                    # Short rows and missing columns are padded with blanks
+                    row.extend([''] * (width + 1 - len(row)))
+                    yield get_values(row)
         
     def load_csv_data(self):
-        """Load all relevant CSV files"""
+        """
+        Load all relevant CSV files
+
+        The method override, field and inheritance rows are streamed, and only the per-module
+        aggregates the analyses use are kept.
+        """
         # Load method overrides
-        methods_csv = os.path.join(self.analysis_results_dir, 'method_overrides.csv')
-        if os.path.exists(methods_csv):
-            with open(methods_csv, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                self.method_overrides = list(reader)
-            logger.info(f"Loaded {len(self.method_overrides)} method override records")
+        module_methods = defaultdict(set)
+        row_count = 0
+        for module, model, method_name, file_path in self._iter_csv_rows(
+                'method_overrides.csv', ('module', 'model', 'method', 'file_path')):
+            row_count += 1
+            if not self._is_considered(module):
+                continue
+
+            self._method_override_counts[module] += 1
+            if module:
+                module_methods[module].add((model, method_name))
+                if model:
+                    self._module_models[module].add(model)
+                    if method_name:
+                        self._method_files[(model, method_name)][module].add(file_path)
+        self._module_methods = {module: frozenset(methods) for module, methods in module_methods.items()}
+        if row_count:
+            logger.info(f"Loaded {row_count} method override records")
         
         # Load fields analysis
-        fields_csv = os.path.join(self.analysis_results_dir, 'fields_analysis.csv')
-        if os.path.exists(fields_csv):
-            with open(fields_csv, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                self.fields_data = list(reader)
-            logger.info(f"Loaded {len(self.fields_data)} field definitions")
+        row_count = 0
+        for module, model in self._iter_csv_rows('fields_analysis.csv', ('module', 'model')):
+            row_count += 1
+            if not self._is_considered(module):
+                continue
+
+            self._field_counts[module] += 1
+            if module and model:
+                self._module_models[module].add(model)
+        if row_count:
+            logger.info(f"Loaded {row_count} field definitions")
         
         # Load module dependencies
-        deps_csv = os.path.join(self.analysis_results_dir, 'module_dependencies.csv')
-        if os.path.exists(deps_csv):
-            with open(deps_csv, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                self.module_dependencies = list(reader)
-            logger.info(f"Loaded {len(self.module_dependencies)} module dependency records")
-        
-        # Load model inheritance relationships
-        inheritance_csv = os.path.join(self.analysis_results_dir, 'model_inheritance.csv')
-        if os.path.exists(inheritance_csv):
-            with open(inheritance_csv, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                self.model_inheritance = list(reader)
-            logger.info(f"Loaded {len(self.model_inheritance)} model inheritance relationships")
+        row_count = 0
+        for source, target in self._iter_csv_rows('module_dependencies.csv', ('source_module', 'target_module')):
+            row_count += 1
+            if source and target:
+                self._dependency_pairs.add(frozenset((source, target)))
+        if row_count:
+            logger.info(f"Loaded {row_count} module dependency records")
         
         # Extract inheritance data from model_inheritance CSV (more accurate than inferring from fields)
         self._extract_inheritance_data()
@@ -82,27 +152,10 @@ class ModuleConsolidationAnalyzer:
         This indicates modules that 'touch' the same base code.
         Only considers eligible modules.
         """
-        # Group by (model, method) -> list of modules
-        method_groups = defaultdict(lambda: defaultdict(set))
-        
-        for method in self.method_overrides:
-            model = method.get('model', '')
-            method_name = method.get('method', '')
-            module = method.get('module', '')
-            
-            # Only consider eligible modules
-            if self.eligible_modules and module not in self.eligible_modules:
-                continue
-            
-            if model and method_name and module:
-                key = f"{model}.{method_name}"
-                method_groups[key][module].add(method.get('file_path', ''))
-        
         # Find methods that are overridden by multiple modules
         overlap_analysis = []
-        for key, modules_dict in method_groups.items():
+        for (model, method_name), modules_dict in self._method_files.items():
             if len(modules_dict) > 1:
-                model, method_name = key.split('.', 1)
                 modules = list(modules_dict.keys())
                 file_count = sum(len(files) for files in modules_dict.values())
                 
@@ -126,32 +179,8 @@ class ModuleConsolidationAnalyzer:
         Returns a matrix of module-to-model relationships.
         Only considers eligible modules.
         """
-        # Track which models each module touches
-        module_models = defaultdict(set)  # module -> set of models
-        
-        # From method overrides (only eligible modules)
-        for method in self.method_overrides:
-            model = method.get('model', '')
-            module = method.get('module', '')
-            
-            # Only consider eligible modules
-            if self.eligible_modules and module not in self.eligible_modules:
-                continue
-            
-            if model and module:
-                module_models[module].add(model)
-        
-        # From field definitions (only eligible modules)
-        for field in self.fields_data:
-            module = field.get('module', '')
-            model = field.get('model', '')
-            
-            # Only consider eligible modules
-            if self.eligible_modules and module not in self.eligible_modules:
-                continue
-            
-            if model and module:
-                module_models[module].add(model)
+        # Models each module touches, from method overrides and field definitions (only eligible modules)
+        module_models = self._module_models
         
         # Find models touched by multiple modules
         model_modules = defaultdict(set)  # model -> set of modules
@@ -188,6 +217,18 @@ class ModuleConsolidationAnalyzer:
         else:
             modules = list(module_models.keys())
         
+        # Models shared by each pair of modules (by index), from the modules touching each model.
+        # Like a sparse module x model incidence product, only pairs sharing a model are visited.
+        model_modules = defaultdict(list)  # model -> indices of the modules touching it, ascending
+        for i, module in enumerate(modules):
+            for model in module_models[module]:
+                model_modules[model].append(i)
+        pair_models = defaultdict(list)  # (i, j) with i < j -> models shared by modules i and j
+        for model, indices in model_modules.items():
+            for k, i in enumerate(indices):
+                for j in indices[k + 1:]:
+                    pair_models[(i, j)].append(model)
+        
         similarities = []
         
         for i, module1 in enumerate(modules):
@@ -195,17 +236,18 @@ class ModuleConsolidationAnalyzer:
             if not models1:
                 continue
                 
-            for module2 in modules[i+1:]:
+            for j in range(i + 1, len(modules)):
+                module2 = modules[j]
                 models2 = module_models[module2]
                 if not models2:
                     continue
                 
                 # Jaccard similarity: intersection / union
-                intersection = models1 & models2
-                union = models1 | models2
+                intersection = pair_models.get((i, j), ())
+                union_size = len(models1) + len(models2) - len(intersection)
                 
-                if union:
-                    similarity = len(intersection) / len(union)
+                if union_size:
+                    similarity = len(intersection) / union_size
                     
                     # Count shared method overrides
                     shared_methods = self._count_shared_methods(module1, module2)
@@ -238,23 +280,11 @@ class ModuleConsolidationAnalyzer:
             if module1 not in self.eligible_modules or module2 not in self.eligible_modules:
                 return 0
         
-        methods1 = {(m['model'], m['method']) for m in self.method_overrides 
-                   if m.get('module') == module1}
-        methods2 = {(m['model'], m['method']) for m in self.method_overrides 
-                   if m.get('module') == module2}
-        
-        return len(methods1 & methods2)
+        return len(self._module_methods.get(module1, _EMPTY) & self._module_methods.get(module2, _EMPTY))
     
     def _check_dependency(self, module1, module2):
         """Check if module1 depends on module2 or vice versa"""
-        for dep in self.module_dependencies:
-            source = dep.get('source_module', '')
-            target = dep.get('target_module', '')
-            
-            if (source == module1 and target == module2) or \
-               (source == module2 and target == module1):
-                return True
-        return False
+        return frozenset((module1, module2)) in self._dependency_pairs
     
     def _get_consolidation_recommendation(self, similarity, shared_methods, has_dependency):
         """Generate recommendation based on similarity metrics"""
@@ -316,10 +346,10 @@ class ModuleConsolidationAnalyzer:
         than inferring from fields/methods.
         """
         # Use model_inheritance CSV which has direct _inherit relationships
-        for inheritance in self.model_inheritance:
-            module = inheritance.get('module', '')
-            inherited_model = inheritance.get('inherited_model', '')
-            inherited_module = inheritance.get('inherited_module', 'unknown')
+        row_count = 0
+        for module, inherited_model, inherited_module in self._iter_csv_rows(
+                'model_inheritance.csv', ('module', 'inherited_model', 'inherited_module')):
+            row_count += 1
             
             # Only consider eligible modules
             if self.eligible_modules and module not in self.eligible_modules:
@@ -335,6 +365,8 @@ class ModuleConsolidationAnalyzer:
                 if module not in self.inheritance_data:
                     self.inheritance_data[module] = set()
                 self.inheritance_data[module].add(inherited_model)
+        if row_count:
+            logger.info(f"Loaded {row_count} model inheritance relationships")
     
     def gather_module_statistics(self):
         """
@@ -347,9 +379,6 @@ class ModuleConsolidationAnalyzer:
         - Field counts
         - Method override counts
         """
-        import config
-        from pathlib import Path
-        
         stats = []
         
         for module in sorted(self.eligible_modules):
@@ -366,21 +395,10 @@ class ModuleConsolidationAnalyzer:
                 'shared_inherited_models': []  # Will be filled later
             }
             
-            # Count fields
-            for field in self.fields_data:
-                if field.get('module') == module:
-                    module_stat['field_count'] += 1
-                    model = field.get('model', '')
-                    if model:
-                        module_stat['models_defined'].add(model)
-            
-            # Count method overrides
-            for method in self.method_overrides:
-                if method.get('module') == module:
-                    module_stat['method_override_count'] += 1
-                    model = method.get('model', '')
-                    if model:
-                        module_stat['models_defined'].add(model)
+            # Count fields and method overrides, and the models they are on
+            module_stat['field_count'] = self._field_counts[module]
+            module_stat['method_override_count'] = self._method_override_counts[module]
+            module_stat['models_defined'].update(self._module_models.get(module, ()))
             
             # Get inheritance data
             if module in self.inheritance_data:
@@ -393,13 +411,17 @@ class ModuleConsolidationAnalyzer:
             if config.BASE_DIR:
                 module_paths = self._find_module_paths(module, config.BASE_DIR)
                 for module_path in module_paths:
-                    python_count, xml_count, loc = self._count_module_files(module_path)
+                    if module_path not in self._module_file_counts:
+                        self._module_file_counts[module_path] = self._count_module_files(module_path)
+                    python_count, xml_count, loc = self._module_file_counts[module_path]
                     module_stat['python_files'] += python_count
                     module_stat['xml_files'] += xml_count
                     module_stat['lines_of_code'] += loc
                     
                     # Count views (rough estimate from XML files)
-                    module_stat['view_count'] += self._count_views_in_module(module_path)
+                    if module_path not in self._module_view_counts:
+                        self._module_view_counts[module_path] = self._count_views_in_module(module_path)
+                    module_stat['view_count'] += self._module_view_counts[module_path]
             
             # Convert sets to strings for CSV
             module_stat['inherited_models_list'] = ', '.join(sorted(module_stat['inherited_models']))
@@ -420,34 +442,38 @@ class ModuleConsolidationAnalyzer:
     
     def _find_module_paths(self, module_name, base_dir):
         """Find all paths that might contain this module"""
-        from pathlib import Path
-        import os
-        
-        paths = []
+        if base_dir not in self._module_path_index:
+            self._module_path_index[base_dir] = self._index_module_paths(base_dir)
+        return self._module_path_index[base_dir].get(module_name, [])
+    
+    def _index_module_paths(self, base_dir):
+        """
+        Find the modules in the common locations and direct subdirectories of a base directory
+
+        Returns:
+            Dictionary of module name -> list of module paths, common locations first
+        """
+        index = defaultdict(list)
         base_path = Path(base_dir)
         
-        # Look for module in common locations
+        # Look for modules in common locations, then in direct subdirectories
         search_dirs = ['user', 'odoo', 'enterprise', 'custom']
+        parent_dirs = [base_path / search_dir for search_dir in search_dirs]
+        parent_dirs.extend(item for item in base_path.iterdir() if item.is_dir())
         
-        for search_dir in search_dirs:
-            potential_path = base_path / search_dir / module_name
-            if potential_path.exists() and (potential_path / '__manifest__.py').exists():
-                paths.append(potential_path)
-        
-        # Also check direct subdirectories
-        for item in base_path.iterdir():
-            if item.is_dir():
-                potential_path = item / module_name
-                if potential_path.exists() and (potential_path / '__manifest__.py').exists():
+        for parent_dir in parent_dirs:
+            if not parent_dir.is_dir():
+                continue
+            for potential_path in parent_dir.iterdir():
+                if (potential_path / '__manifest__.py').exists():
+                    paths = index[potential_path.name]
                     if potential_path not in paths:
                         paths.append(potential_path)
         
-        return paths
+        return index
     
     def _count_module_files(self, module_path):
         """Count Python and XML files and lines of code in a module"""
-        from pathlib import Path
-        
         python_count = 0
         xml_count = 0
         loc = 0
@@ -455,67 +481,66 @@ class ModuleConsolidationAnalyzer:
         if not module_path.exists():
             return python_count, xml_count, loc
         
-        # Count Python files (exclude __init__.py and __manifest__.py)
-        for py_file in module_path.rglob('*.py'):
-            # Skip __pycache__, __init__.py, __manifest__.py, and test files
-            if '__pycache__' in str(py_file):
-                continue
-            if py_file.name in ('__init__.py', '__manifest__.py'):
-                continue
-            if 'test_' in py_file.name:
-                continue
-            python_count += 1
-            try:
-                with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    loc += len([line for line in f if line.strip()])
-            except:
-                pass
-        
-        # Count XML files
-        for xml_file in module_path.rglob('*.xml'):
-            xml_count += 1
+        # Count Python files (exclude __init__.py, __manifest__.py and test files) and XML files in one walk
+        for root, dirs, files in os.walk(module_path):
+            dirs[:] = [d for d in dirs if d != '__pycache__']
+            for file in files:
+                if file.endswith('.xml'):
+                    xml_count += 1
+                elif file.endswith('.py'):
+                    if file in ('__init__.py', '__manifest__.py') or 'test_' in file:
+                        continue
+                    python_count += 1
+                    try:
+                        with open(os.path.join(root, file), 'rb') as f:
+                            loc += sum(1 for line in f.read().splitlines() if line.strip())
+                    except OSError:
+                        pass
         
         return python_count, xml_count, loc
     
     def _count_views_in_module(self, module_path):
         """Count views in XML files"""
-        from pathlib import Path
-        import xml.etree.ElementTree as ET
-        
         view_count = 0
-        seen_records = set()  # Track to avoid double counting
         
         for xml_file in module_path.rglob('*.xml'):
             try:
-                # Try to parse and count actual view records
-                tree = ET.parse(xml_file)
-                root = tree.getroot()
-                
-                # Count <record> elements with model="ir.ui.view" (case-insensitive)
-                for record in root.findall(".//record"):
-                    model = record.get('model', '')
+                # Stream the file and count actual view records, only adding them up once it parsed
+                file_view_count = 0
+                seen_records = set()  # Track to avoid double counting
+                root = None
+                for event, elem in ET.iterparse(str(xml_file), events=('start', 'end')):
+                    if event == 'start':
+                        if root is None:
+                            root = elem
+                        continue
+                    if elem.tag != 'record' or elem is root:
+                        continue
+                    
+                    # Count <record> elements with model="ir.ui.view" (case-insensitive)
+                    model = elem.get('model', '')
                     if model and 'ir.ui.view' in model.lower():
                         # Use record ID to avoid double counting
-                        record_id = record.get('id', '')
+                        record_id = elem.get('id', '')
                         if record_id:
-                            key = f"{xml_file}:{record_id}"
-                            if key not in seen_records:
-                                seen_records.add(key)
-                                view_count += 1
+                            if record_id not in seen_records:
+                                seen_records.add(record_id)
+                                file_view_count += 1
                         else:
                             # No ID, just count it
-                            view_count += 1
+                            file_view_count += 1
+                    
+                    # Records are not needed once counted
+                    elem.clear()
+                view_count += file_view_count
             except:
                 # Fallback: simple text search
                 try:
-                    with open(xml_file, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        # Count <record> elements with model="ir.ui.view"
-                        # Use a simple regex-like approach to avoid double counting
-                        view_count += max(
-                            content.count('model="ir.ui.view"'),
-                            content.count("model='ir.ui.view'")
-                        )
+                    with open_bytes(xml_file) as content:
+                        # Count <record> elements with model="ir.ui.view" for each quote style in one pass,
+                        # taking the larger count to avoid double counting
+                        quote_counts = Counter(match.group(1) for match in _VIEW_MODEL_RE.finditer(content))
+                        view_count += max(quote_counts.values(), default=0)
                 except:
                     pass
         
@@ -635,60 +660,44 @@ class ModuleConsolidationAnalyzer:
         
         # Export module statistics
         if results.get('module_statistics'):
-            with open(os.path.join(output_dir, 'module_statistics.csv'), 'w', newline='', encoding='utf-8') as f:
-                fieldnames = ['module', 'python_files', 'xml_files', 'lines_of_code', 'view_count',
-                             'field_count', 'method_override_count', 'inherited_models_count',
-                             'inherited_models_list', 'models_defined_count', 'models_defined_list',
-                             'shared_inherited_models_count', 'shared_inherited_models']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(results['module_statistics'])
+            fieldnames = ['module', 'python_files', 'xml_files', 'lines_of_code', 'view_count',
+                         'field_count', 'method_override_count', 'inherited_models_count',
+                         'inherited_models_list', 'models_defined_count', 'models_defined_list',
+                         'shared_inherited_models_count', 'shared_inherited_models']
+            write_csv_rows(os.path.join(output_dir, 'module_statistics.csv'), fieldnames, results['module_statistics'])
             logger.info(f"Exported statistics for {len(results['module_statistics'])} modules")
             
             # Export inherited model summary
             inherited_model_summary = self._generate_inherited_model_summary(results['module_statistics'])
             if inherited_model_summary:
-                with open(os.path.join(output_dir, 'inherited_models_summary.csv'), 'w', newline='', encoding='utf-8') as f:
-                    fieldnames = ['inherited_model', 'modules_inheriting', 'module_count', 'is_shared', 'sharing_details']
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(inherited_model_summary)
+                fieldnames = ['inherited_model', 'modules_inheriting', 'module_count', 'is_shared', 'sharing_details']
+                write_csv_rows(os.path.join(output_dir, 'inherited_models_summary.csv'), fieldnames, inherited_model_summary)
                 logger.info(f"Exported inherited model summary for {len(inherited_model_summary)} models")
         
         # Export method overlaps
         if results.get('method_overlaps'):
-            with open(os.path.join(output_dir, 'method_overlaps.csv'), 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['model', 'method', 'modules', 'module_count', 
-                                                       'total_overrides', 'severity'])
-                writer.writeheader()
-                writer.writerows(results['method_overlaps'])
+            fieldnames = ['model', 'method', 'modules', 'module_count', 'total_overrides', 'severity']
+            write_csv_rows(os.path.join(output_dir, 'method_overlaps.csv'), fieldnames, results['method_overlaps'])
             logger.info(f"Exported {len(results['method_overlaps'])} method overlap records")
         
         # Export model overlaps
         if results.get('model_overlaps'):
-            with open(os.path.join(output_dir, 'model_overlaps.csv'), 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['model', 'modules', 'module_count', 'severity'])
-                writer.writeheader()
-                writer.writerows(results['model_overlaps'])
+            fieldnames = ['model', 'modules', 'module_count', 'severity']
+            write_csv_rows(os.path.join(output_dir, 'model_overlaps.csv'), fieldnames, results['model_overlaps'])
             logger.info(f"Exported {len(results['model_overlaps'])} model overlap records")
         
         # Export module similarities
         if results.get('module_similarities'):
-            with open(os.path.join(output_dir, 'module_similarities.csv'), 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['module1', 'module2', 'similarity_score', 
-                                                       'shared_models', 'shared_models_list', 
-                                                       'shared_methods', 'has_dependency', 'recommendation'])
-                writer.writeheader()
-                writer.writerows(results['module_similarities'])
+            fieldnames = ['module1', 'module2', 'similarity_score', 'shared_models', 'shared_models_list',
+                          'shared_methods', 'has_dependency', 'recommendation']
+            write_csv_rows(os.path.join(output_dir, 'module_similarities.csv'), fieldnames, results['module_similarities'])
             logger.info(f"Exported {len(results['module_similarities'])} module similarity records")
         
         # Export consolidation groups
         if results.get('consolidation_groups'):
-            with open(os.path.join(output_dir, 'consolidation_groups.csv'), 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['modules', 'similarity_score', 'shared_models', 
-                                                       'shared_models_list', 'shared_methods', 'recommendation'])
-                writer.writeheader()
-                writer.writerows(results['consolidation_groups'])
+            fieldnames = ['modules', 'similarity_score', 'shared_models', 'shared_models_list', 'shared_methods',
+                          'recommendation']
+            write_csv_rows(os.path.join(output_dir, 'consolidation_groups.csv'), fieldnames, results['consolidation_groups'])
             logger.info(f"Exported {len(results['consolidation_groups'])} consolidation group recommendations")
 
 
@@ -47,14 +47,14 @@ def generate_module_summary(output_dir, registry, all_fields, all_methods, eligi
     logger.info(f"Eligible modules: {sorted(eligible_modules)}")
     logger.info(f"Total fields available: {len(all_fields)}, Total methods available: {len(all_methods)}")
     
-    # Debug: Show unique modules in the data
-    if all_fields:
+    # Debug: Show unique modules in the data (only collected when debug logging is on)
+    if all_fields and logger.isEnabledFor(logging.DEBUG):
         unique_field_modules = set(f.get('module', 'unknown') for f in all_fields)
         unique_root_modules = set(f.get('root_module', '') for f in all_fields if f.get('root_module'))
         logger.debug(f"Unique field modules in data: {sorted(unique_field_modules)}")
         logger.debug(f"Unique root modules in data: {sorted(unique_root_modules)}")
     
-    if all_methods:
+    if all_methods and logger.isEnabledFor(logging.DEBUG):
         unique_method_modules = set(m.get('module', 'unknown') for m in all_methods)
         logger.debug(f"Unique method modules in data: {sorted(unique_method_modules)}")
     
@@ -236,8 +236,7 @@ def generate_module_summary(output_dir, registry, all_fields, all_methods, eligi
             logger.error(f"File was not created: {output_file}")
             raise FileNotFoundError(f"Output file was not created: {output_file}")
     except Exception as e:
-        logger.error(f"Error writing module summary to {output_file}: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.error(f"Error writing module summary to {output_file}: {e}",
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         raise
 
@@ -29,7 +29,7 @@ class RestructuringRecommender:
         if eligible_modules is not None:
             self.eligible_modules = set(eligible_modules)
         else:
-            self.eligible_modules = set(config.ELIGIBLE_MODULES_FOR_CORE)
+            self.eligible_modules = config.ELIGIBLE_MODULES_FOR_CORE_SET
         
         logger.info(f"Eligible modules for consolidation: {sorted(self.eligible_modules)}")
         
@@ -158,10 +158,15 @@ class RestructuringRecommender:
                 deps_graph[module].add(depends_on)
         
         # Find cycles
+        # Modules known to reach no cycle are shared across the searches so each
+        # acyclic part of the graph is explored only once
+        acyclic = set()
         for module in deps_graph:
+            if module in acyclic:
+                continue
             visited = set()
             path = []
-            cycle = self._find_cycle(module, deps_graph, visited, path)
+            cycle = self._find_cycle(module, deps_graph, visited, path, set(), acyclic)
             if cycle:
                 # Normalize cycle (start from smallest module name to avoid duplicates)
                 cycle_tuple = tuple(sorted(set(cycle)))
@@ -171,25 +176,33 @@ class RestructuringRecommender:
         
         return circular
     
-    def _find_cycle(self, module, graph, visited, path):
-        """Find cycles in dependency graph"""
-        if module in path:
+    def _find_cycle(self, module, graph, visited, path, on_path, acyclic):
+        """
+        Find cycles in dependency graph
+
+        on_path holds the modules of path for constant time lookups. Modules whose search
+        finished without a cycle are added to acyclic: no cycle is reachable from them.
+        """
+        if module in on_path:
             # Cycle found
             cycle_start = path.index(module)
             return path[cycle_start:] + [module]
         
-        if module in visited:
+        if module in visited or module in acyclic:
             return None
         
         visited.add(module)
         path.append(module)
+        on_path.add(module)
         
         for dep in graph.get(module, set()):
-            cycle = self._find_cycle(dep, graph, visited, path)
+            cycle = self._find_cycle(dep, graph, visited, path, on_path, acyclic)
             if cycle:
                 return cycle
         
         path.pop()
+        on_path.discard(module)
+        acyclic.add(module)
         return None
     
     def _generate_priority_order(self, fields_to_move):
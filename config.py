@@ -1,8 +1,12 @@
 # odoo_analyzer/config.py
+import os
 
 # Default value, will be updated by main script
 BASE_DIR = ""
 
+# Directory of the on-disk parse cache (None disables caching), will be updated by main script
+PARSE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'odoo_analyzer')
+
 # Modules eligible for consolidation into csl_core
 ELIGIBLE_MODULES_FOR_CORE = [
     'bista_convert_product',
@@ -28,4 +32,7 @@ ELIGIBLE_MODULES_FOR_CORE = [
     'project_repair_workflow',
     'project_repair_workflow_trigger',
     'sale_disable_auto_followers',
-]
\ No newline at end of file
+]
+
+# Frozen once for membership tests
+ELIGIBLE_MODULES_FOR_CORE_SET = frozenset(ELIGIBLE_MODULES_FOR_CORE or ())
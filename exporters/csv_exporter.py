@@ -4,9 +4,48 @@ import json
 import logging
 import os
 from collections import defaultdict
+from operator import itemgetter
 
 logger = logging.getLogger(__name__)
 
+# Write buffer of exported CSV files; large exports flush in fewer, bigger writes
+CSV_BUFFER_SIZE = 1 << 20
+
+
+def write_csv_rows(file_path, field_names, rows):
+    """
+    Write row dictionaries to a CSV file, streaming the rows
+
+    Rows are written positionally, which skips DictWriter's per-row dict handling;
+    missing columns are blank and extra keys are ignored.
+
+    Args:
+        file_path: Path of the CSV file to write
+        field_names: Columns to write, in order
+        rows: Iterable of row dictionaries
+    """
+    with open(file_path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(field_names)
+        writer.writerows(_iter_row_values(rows, field_names))
+
+
+def _iter_row_values(rows, field_names):
+    """Yield the values of each row dictionary in column order, blank for missing columns"""
+    if len(field_names) == 1:
+        field_name = field_names[0]
+        get_values = lambda row: (row[field_name],)
+    else:
+        get_values = itemgetter(*field_names)
+
+    for row in rows:
+        try:
+            # Rows usually have every column, so fetch them all in one call
+            yield get_values(row)
+        except KeyError:
+            yield [row.get(field_name, '') for field_name in field_names]
+
+
 def export_fields_to_csv(fields, output_file='fields_analysis.csv'):
     """Export field definitions to CSV"""
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
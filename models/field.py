@@ -1,4 +1,5 @@
 """Field definition class for Odoo analyzer"""
+import sys
 from pathlib import Path
 import config
 
@@ -47,8 +48,73 @@ def format_module_set(modules):
         return ""
     return ', '.join(sorted(modules))
 
+def summarize_field_usage(usages):
+    """
+    Summarize the usages of one field key
+
+    Args:
+        usages: List of usage dictionaries (from FieldUsage.to_dict()) or FieldUsage objects
+
+    Returns:
+        tuple: (usage_count, modules, views) where modules and views are sets
+    """
+    used_in_modules = set()
+    used_in_views = set()
+    for usage in usages:
+        # field_usage contains dictionaries (from FieldUsage.to_dict())
+        if isinstance(usage, dict):
+            # Extract module
+            if usage.get('module'):
+                used_in_modules.add(usage['module'])
+
+            # Extract view usage
+            context = usage.get('context')
+            if context:
+                # Check if it's a view
+                record_type = usage.get('record_type', '')
+                if record_type == 'view' or ('.' in context and record_type != 'data'):
+                    # Likely a view ID (format: module.view_id) or explicitly marked as view
+                    used_in_views.add(context)
+        elif hasattr(usage, 'module'):
+            # Handle FieldUsage objects directly (fallback)
+            if usage.module:
+                used_in_modules.add(usage.module)
+            if hasattr(usage, 'context') and usage.context:
+                if hasattr(usage, 'record_type') and usage.record_type == 'view':
+                    used_in_views.add(usage.context)
+    return len(usages), used_in_modules, used_in_views
+
+def format_views(views):
+    """Format a set of views as a sorted string"""
+    return ','.join(sorted(views)) if views else ''
+
+def summarize_field_usage_for_export(usages):
+    """
+    Summarize the usages of one field key with the module and view columns already formatted
+
+    Returns:
+        tuple: (usage_count, modules, views, formatted_modules, formatted_views)
+    """
+    usage_count, used_in_modules, used_in_views = summarize_field_usage(usages)
+    return (usage_count, used_in_modules, used_in_views,
+            format_module_set(used_in_modules), format_views(used_in_views))
+
 class FieldDefinition:
     """Store information about an Odoo field"""
+    # Fixed attribute layout: smaller instances and faster attribute access
+    __slots__ = (
+        'model', 'name', 'field_type', 'attributes', 'file_path', 'module',
+        'is_computed', 'is_stored', 'is_related', 'dependency_fields',
+        'usage_count', 'used_in_modules', 'used_in_views',
+        'root_model', 'root_module', 'extending_modules', 'field_key',
+        'is_extension', 'extended_from', 'original_attributes', 'added_attributes',
+        'modified_attributes', 'removed_attributes', 'in_extension_class',
+    )
+
+    # Attributes holding names repeated across many fields; they are interned so equal
+    # names share one string object
+    _INTERNED_ATTRIBUTES = ('model', 'name', 'field_type', 'file_path', 'module')
+
     def __init__(self, model, name, field_type, attributes, file_path):
         self.model = model  # Model where field is defined (may be child model)
         self.name = name
@@ -56,6 +122,7 @@ class FieldDefinition:
         self.attributes = attributes
         self.file_path = file_path
         self.module = get_module_name(file_path)  # Module where field is defined
+        self._intern_strings()
         self.is_computed = 'compute' in attributes
         # If 'store' is explicitly set, use that value
         if 'store' in attributes:
@@ -84,7 +151,25 @@ class FieldDefinition:
         self.added_attributes = {}
         self.modified_attributes = {}
         self.removed_attributes = {}  # Attributes that were in original but not in extension
+        self.in_extension_class = False  # True if defined in a class with only _inherit (no _name)
     
+    def __getstate__(self):
+        """Get the attributes to pickle (e.g. to return the field from a parser worker)"""
+        return {attr: getattr(self, attr) for attr in self.__slots__ if hasattr(self, attr)}
+
+    def __setstate__(self, state):
+        """Restore a pickled field, interning its names again"""
+        for attr, value in state.items():
+            setattr(self, attr, value)
+        self._intern_strings()
+
+    def _intern_strings(self):
+        """Intern the repeated name attributes"""
+        for attr in self._INTERNED_ATTRIBUTES:
+            value = getattr(self, attr, None)
+            if isinstance(value, str):
+                setattr(self, attr, sys.intern(value))
+
     def set_root_owner(self, root_model, root_module):
         """Set the root/original owner of this field and update field_key"""
         self.root_model = root_model
@@ -97,11 +182,48 @@ class FieldDefinition:
         if module_name and module_name != self.root_module:
             self.extending_modules.add(module_name)
 
+    def reset_extension(self):
+        """Forget the parent field and root owner found so far, so the field can be linked again"""
+        self.root_model = None
+        self.root_module = None
+        self.field_key = f"{self.model}.{self.name}"
+        self.is_extension = False
+        self.extended_from = None
+        self.original_attributes = {}
+        self.added_attributes = {}
+        self.modified_attributes = {}
+        self.removed_attributes = {}
+
     def mark_as_extension(self, original_field_path):
         """Mark this field as an extension of a core field"""
         self.is_extension = True
         self.extended_from = original_field_path
 
+    def compare_attributes(self, parent_field):
+        """Track which attributes were added, modified, or removed relative to the parent field"""
+        self.original_attributes = parent_field.attributes.copy()
+        self.added_attributes = {}
+        self.modified_attributes = {}
+        self.removed_attributes = {}
+
+        # Compare attributes to determine which were added or modified
+        for attr_name, attr_value in self.attributes.items():
+            if attr_name not in parent_field.attributes:
+                # This is a new attribute
+                self.added_attributes[attr_name] = attr_value
+            elif attr_value != parent_field.attributes[attr_name]:
+                # This attribute was modified
+                self.modified_attributes[attr_name] = {
+                    'old': parent_field.attributes[attr_name],
+                    'new': attr_value
+                }
+
+        # Check for removed attributes (in original but not in extension)
+        for attr_name, attr_value in parent_field.attributes.items():
+            if attr_name not in self.attributes:
+                # This attribute was removed in the extension
+                self.removed_attributes[attr_name] = attr_value
+
     def is_redundant_extension(self):
         """
         Check if this field extension is redundant/unnecessary.
@@ -145,13 +267,15 @@ class FieldDefinition:
         # All attributes are unchanged and nothing was added/removed/modified
         return True
 
-    def to_dict(self, eligible_modules=None, field_usage=None):
+    def to_dict(self, eligible_modules=None, field_usage=None, usage_summaries=None):
         """
         Convert to dictionary for CSV export
         
         Args:
             eligible_modules: Set of eligible module names (for is_eligible_module flag)
             field_usage: Dictionary of field_key -> list of FieldUsage objects (for usage stats)
+            usage_summaries: Optional dictionary caching summarize_field_usage_for_export() results by field_key,
+                             shared across calls so definitions with the same key summarize once
         """
         # Determine if module is eligible
         # Only check the actual module where THIS field definition exists, not root_module
@@ -163,34 +287,32 @@ class FieldDefinition:
         
         # Get usage statistics from field_usage if provided
         usage_count = self.usage_count
-        used_in_modules = self.used_in_modules.copy() if self.used_in_modules else set()
-        used_in_views = self.used_in_views.copy() if self.used_in_views else set()
-        
+        used_in_modules = self.used_in_modules
+        used_in_views = self.used_in_views
+        formatted_modules = None
+        formatted_views = None
+
         if field_usage and self.field_key in field_usage:
-            usages = field_usage[self.field_key]
-            usage_count = len(usages)
-            for usage in usages:
-                # field_usage contains dictionaries (from FieldUsage.to_dict())
-                if isinstance(usage, dict):
-                    # Extract module
-                    if usage.get('module'):
-                        used_in_modules.add(usage['module'])
-                    
-                    # Extract view usage
-                    context = usage.get('context')
-                    if context:
-                        # Check if it's a view
-                        record_type = usage.get('record_type', '')
-                        if record_type == 'view' or ('.' in context and record_type != 'data'):
-                            # Likely a view ID (format: module.view_id) or explicitly marked as view
-                            used_in_views.add(context)
-                elif hasattr(usage, 'module'):
-                    # Handle FieldUsage objects directly (fallback)
-                    if usage.module:
-                        used_in_modules.add(usage.module)
-                    if hasattr(usage, 'context') and usage.context:
-                        if hasattr(usage, 'record_type') and usage.record_type == 'view':
-                            used_in_views.add(usage.context)
+            if usage_summaries is None:
+                summary = summarize_field_usage_for_export(field_usage[self.field_key])
+            else:
+                summary = usage_summaries.get(self.field_key)
+                if summary is None:
+                    summary = usage_summaries[self.field_key] = summarize_field_usage_for_export(
+                        field_usage[self.field_key])
+            usage_count, usage_modules, usage_views, formatted_modules, formatted_views = summary
+            # The summary is already formatted, unless this definition has usage of its own to merge
+            if used_in_modules:
+                used_in_modules = used_in_modules | usage_modules
+                formatted_modules = None
+            if used_in_views:
+                used_in_views = used_in_views | usage_views
+                formatted_views = None
+
+        if formatted_modules is None:
+            formatted_modules = format_module_set(used_in_modules)
+        if formatted_views is None:
+            formatted_views = format_views(used_in_views)
         
         # Check if extension is redundant
         is_redundant = self.is_redundant_extension()
@@ -211,8 +333,8 @@ class FieldDefinition:
             'is_stored': str(self.is_stored),
             'is_related': str(self.is_related),
             'usage_count': str(usage_count),
-            'used_in_modules': format_module_set(used_in_modules),
-            'used_in_views': ','.join(sorted(used_in_views)) if used_in_views else '',
+            'used_in_modules': formatted_modules,
+            'used_in_views': formatted_views,
             'is_extension': str(self.is_extension),
             'extended_from': self.extended_from if self.extended_from else '',
             'added_attributes': str(self.added_attributes),
@@ -1,4 +1,5 @@
 """Field usage tracking class with record type classification"""
+import sys
 
 class FieldUsage:
     """Store information about field usage"""
@@ -8,11 +9,12 @@ class FieldUsage:
     RECORD_TYPE_UNKNOWN = 'unknown'
 
     def __init__(self, field_key, context, module, file_path, model=None):
-        self.field_key = field_key
+        # Keys, modules and paths repeat across many usages, so they are interned
+        self.field_key = sys.intern(field_key)
         self.context = context  # View ID or file name
-        self.module = module
-        self.file_path = file_path
-        self.model = model if model else ''  # Empty string if no model
+        self.module = sys.intern(module)
+        self.file_path = sys.intern(file_path)
+        self.model = sys.intern(model) if model else ''  # Empty string if no model
         self.record_type = self.RECORD_TYPE_UNKNOWN  # Default to unknown
         self.view_type = ''  # Form, tree, kanban, etc.
 
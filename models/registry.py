@@ -5,6 +5,11 @@ from collections import defaultdict
 logger = logging.getLogger(__name__)
 
 
+def _field_map():
+    """Factory for per-model field maps (module-level so the registry stays picklable)"""
+    return defaultdict(list)
+
+
 class ModelRegistry:
     """
     Registry for tracking Odoo models, fields, and inheritance
@@ -12,7 +17,7 @@ class ModelRegistry:
 
     def __init__(self):
         self.models = {}  # model_name -> {class_name, module, file_path}
-        self.fields = defaultdict(lambda: defaultdict(list))  # model_name -> {field_name: [FieldDefinition, ...]}
+        self.fields = defaultdict(_field_map)  # model_name -> {field_name: [FieldDefinition, ...]}
         self.inherits = defaultdict(list)  # model_name -> [inherited_models]
         self.module_extensions = defaultdict(list)  # module -> [(model_name, inherited_model), ...] for extension-only classes
         self.views = {}  # view_id -> {model, inherit_id, view_type}
@@ -21,6 +26,7 @@ class ModelRegistry:
         self.manifest_dependencies = []  # List of manifest dependency info
         self.module_dependency_graph = {}  # module -> set of dependencies
         self.module_base_priority = {}  # module -> priority score (lower = more base)
+        self._inheritance_chains = {}  # model_name -> cached get_model_inheritance_chain() result
 
     def register_model(self, model_name, class_name, module, file_path):
         """Register a model with its class name, module, and file path"""
@@ -35,6 +41,8 @@ class ModelRegistry:
         """Register a model inheritance relationship"""
         if inherited_model and inherited_model not in self.inherits[model_name]:
             self.inherits[model_name].append(inherited_model)
+            # Any cached chain may pass through this model
+            self._inheritance_chains.clear()
     
     def register_module_extension(self, module, model_name, inherited_model):
         """Register that a module extends a model (for extension-only classes without _name)"""
@@ -73,6 +81,107 @@ class ModelRegistry:
             # Set temporary root (will be updated if parent is found later)
             field.set_root_owner(model_name, field.module)
     
+    def find_parent_field(self, model_name, field_name, extension_only=False):
+        """
+        Find an already registered definition that a new field definition extends
+
+        Args:
+            model_name: Model the new field is defined on
+            field_name: Name of the field
+            extension_only: True if the defining class only has _inherit (no _name)
+
+        Returns:
+            Tuple of (parent_field, parent_model), or (None, None) if not found
+        """
+        # Extension-only classes extend the model itself, so check if the field already exists there
+        if extension_only and model_name:
+            existing_field = self.get_field(model_name, field_name)
+            if existing_field:
+                return existing_field, model_name
+
+        # Also check inheritance chain for parent fields
+        if model_name in self.inherits:
+            for inherited_model in self.get_model_inheritance_chain(model_name):
+                if inherited_model == model_name:
+                    continue  # Skip self
+
+                existing_field = self.get_field(inherited_model, field_name)
+                if existing_field:
+                    return existing_field, inherited_model
+
+        return None, None
+
+    def link_parent_field(self, field, parent_field, parent_model):
+        """Mark a field as an extension of parent_field and set its root owner"""
+        field.mark_as_extension(parent_field.file_path)
+        field.compare_attributes(parent_field)
+
+        # Set root owner immediately since we found the parent
+        parent_module = self._get_model_module(parent_model)
+        if not parent_module or parent_module == 'unknown':
+            parent_module = parent_field.module
+        field.set_root_owner(parent_model, parent_module)
+
+    def bulk_ingest(self, results):
+        """
+        Merge registries built in isolation (e.g. by parser worker processes) into this one.
+
+        The models, inheritance and views of every partial registry are copied over first, so
+        fields can be linked to parents through _inherit chains declared in any file. Then each
+        field is linked and registered in parse order against the merged state, like a two-pass
+        parse of all files does. Links a worker made from its own file alone are redone.
+
+        Args:
+            results: Iterable of (partial, fields) tuples in parse order, where partial is the
+                     ModelRegistry populated by the worker and fields are the FieldDefinition
+                     objects it returned
+        """
+        results = list(results)
+        for partial, _ in results:
+            self._merge_definitions(partial)
+
+        for _, fields in results:
+            for field in fields:
+                field.reset_extension()
+                parent_field, parent_model = self.find_parent_field(field.model, field.name,
+                                                                    field.in_extension_class)
+                if parent_field:
+                    self.link_parent_field(field, parent_field, parent_model)
+                self.register_field(field.model, field)
+
+    def _merge_definitions(self, partial):
+        """Copy the models, inheritance and views of a partial registry into this one"""
+        for model_name, model_info in partial.models.items():
+            self.register_model(model_name, model_info['class_name'], model_info['module'],
+                                model_info['file_path'])
+        self.class_to_model.update(partial.class_to_model)
+
+        for model_name, inherited_models in partial.inherits.items():
+            for inherited_model in inherited_models:
+                self.register_inherit(model_name, inherited_model)
+
+        for module, extensions in partial.module_extensions.items():
+            self.module_extensions[module].extend(extensions)
+
+        self.views.update(partial.views)
+
+    def drop_field_index(self):
+        """
+        Drop the per-model field index of a registry whose fields are handed over separately.
+
+        bulk_ingest() re-registers fields from the list it is given, which rebuilds the field
+        index and field owners in the target registry, so a partial registry doesn't need to
+        carry them across processes or into the parse cache.
+        """
+        self.fields.clear()
+        self.field_owners.clear()
+        self._inheritance_chains.clear()
+
+    def has_definitions(self):
+        """Whether bulk_ingest() would copy anything other than fields from this registry"""
+        return bool(self.models or self.class_to_model or self.inherits or
+                    self.module_extensions or self.views)
+
     def _get_field_file_path(self, model_name, field_name):
         """Get the file path where a field is defined"""
         fields_list = self.get_all_fields(model_name, field_name)
@@ -116,10 +225,15 @@ class ModelRegistry:
             visited: Set of already visited models (to prevent infinite loops)
 
         Returns:
-            List of models in inheritance chain
+            List of models in inheritance chain (cached until the next register_inherit(),
+            so callers must not modify it)
         """
         if visited is None:
-            visited = set()
+            # Chains are looked up for every registered field; compute each one once
+            chain = self._inheritance_chains.get(model_name)
+            if chain is None:
+                chain = self._inheritance_chains[model_name] = self.get_model_inheritance_chain(model_name, set())
+            return chain
 
         if model_name in visited:
             # Prevent infinite loops
@@ -2,18 +2,23 @@
 import ast
 import logging
 import os
+from utils import parse_cache
 from utils.file_utils import get_module_name
 
 logger = logging.getLogger(__name__)
 
+def _read_manifest(file_path):
+    """Read the literal dictionary of a manifest file"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Use ast to safely evaluate the Python literals
+    return ast.literal_eval(content)
+
 def parse_manifest_file(file_path):
     """Extract information from a module's __manifest__.py"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Use ast to safely evaluate the Python literals
-        manifest_dict = ast.literal_eval(content)
+        manifest_dict = parse_cache.cached(file_path, 'manifest', _read_manifest)
 
         return {
             'module': get_module_name(file_path),
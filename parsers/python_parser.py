@@ -2,7 +2,10 @@
 import ast
 import logging
 import sys
-from utils.file_utils import get_files, get_module_name
+import config
+from models.registry import ModelRegistry
+from utils import parse_cache
+from utils.file_utils import get_files, get_module_name, open_bytes
 from models.field import FieldDefinition
 
 
@@ -12,8 +15,8 @@ class ModelVisitor(ast.NodeVisitor):
     """AST visitor to extract model information"""
 
     def __init__(self, file_path, registry):
-        self.file_path = file_path
-        self.module = get_module_name(file_path)
+        self.file_path = sys.intern(file_path)
+        self.module = sys.intern(get_module_name(file_path))
         self.registry = registry
         self.current_class = None
 
@@ -97,8 +100,8 @@ class FieldVisitor(ast.NodeVisitor):
     """AST visitor to extract field definitions"""
 
     def __init__(self, file_path, registry):
-        self.file_path = file_path
-        self.module = get_module_name(file_path)
+        self.file_path = sys.intern(file_path)
+        self.module = sys.intern(get_module_name(file_path))
         self.registry = registry
         self.current_class = None
         self.current_model = None
@@ -212,73 +215,18 @@ class FieldVisitor(ast.NodeVisitor):
                             self.file_path
                         )
 
+                        field.in_extension_class = self.is_extension_class
+
                         # Check if this field extends a parent field
                         # This happens when:
                         # 1. The class only has _inherit (no _name) - it's extending the model
                         # 2. OR the model inherits from another model and the field exists in parent
-                        
-                        parent_field = None
-                        parent_model = None
-                        
-                        # First, check if this is an extension-only class (only _inherit, no _name)
-                        # In this case, the current_model IS the inherited model, so check if field exists there
-                        if self.is_extension_class and self.current_model:
-                            # Check if field already exists in this model (from parent module)
-                            existing_field = self.registry.get_field(self.current_model, field_name)
-                            if existing_field:
-                                parent_field = existing_field
-                                parent_model = self.current_model
-                        
-                        # Also check inheritance chain for parent fields
-                        if not parent_field and self.current_model in self.registry.inherits:
-                            # Get all models in the inheritance chain
-                            inherited_models = self.registry.get_model_inheritance_chain(self.current_model)
-                            
-                            # Check if the field is defined in any parent model
-                            for inherited_model in inherited_models:
-                                if inherited_model == self.current_model:
-                                    continue  # Skip self
-                                
-                                existing_field = self.registry.get_field(inherited_model, field_name)
-                                if existing_field:
-                                    parent_field = existing_field
-                                    parent_model = inherited_model
-                                    break
-                        
+                        parent_field, parent_model = self.registry.find_parent_field(
+                            self.current_model, field_name, self.is_extension_class)
+
                         # If we found a parent field, mark this as an extension
                         if parent_field and parent_model:
-                            # This is an extension of an existing field
-                            field.mark_as_extension(parent_field.file_path)
-                            
-                            # Track which attributes were added, modified, or removed
-                            field.original_attributes = parent_field.attributes.copy()
-                            field.added_attributes = {}
-                            field.modified_attributes = {}
-                            field.removed_attributes = {}
-                            
-                            # Compare attributes to determine which were added or modified
-                            for attr_name, attr_value in attributes.items():
-                                if attr_name not in parent_field.attributes:
-                                    # This is a new attribute
-                                    field.added_attributes[attr_name] = attr_value
-                                elif attr_value != parent_field.attributes[attr_name]:
-                                    # This attribute was modified
-                                    field.modified_attributes[attr_name] = {
-                                        'old': parent_field.attributes[attr_name],
-                                        'new': attr_value
-                                    }
-                            
-                            # Check for removed attributes (in original but not in extension)
-                            for attr_name, attr_value in parent_field.attributes.items():
-                                if attr_name not in attributes:
-                                    # This attribute was removed in the extension
-                                    field.removed_attributes[attr_name] = attr_value
-                            
-                            # Set root owner immediately if we found the parent
-                            parent_module = self.registry._get_model_module(parent_model)
-                            if not parent_module or parent_module == 'unknown':
-                                parent_module = parent_field.module
-                            field.set_root_owner(parent_model, parent_module)
+                            self.registry.link_parent_field(field, parent_field, parent_model)
 
                         # Process compute methods
                         if 'compute' in attributes:
@@ -378,13 +326,82 @@ class FieldVisitor(ast.NodeVisitor):
         field.dependency_fields = list(set(dep_fields))
 
 
-def parse_python_file(file_path, registry):
-    """Parse Python file to extract model and field information"""
+# Nodes whose body may start with a docstring
+_DOCSTRING_OWNERS = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def _strip_docstrings(tree):
+    """Remove docstrings from the tree, the visitors never look at them"""
+    for node in ast.walk(tree):
+        if isinstance(node, _DOCSTRING_OWNERS) and len(node.body) > 1:
+            first = node.body[0]
+            if isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant) and \
+                    isinstance(first.value.value, str):
+                del node.body[0]
+    return tree
+
+
+def _read_python_ast(file_path):
+    """Read and parse a Python file"""
+    # Parse the raw bytes so the source is decoded only once, honoring any coding declaration
+    with open_bytes(file_path) as source:
+        return _strip_docstrings(ast.parse(source, filename=file_path))
+
+
+def load_python_ast(file_path):
+    """Get the AST of a Python file, reusing the on-disk parse cache when the file is unchanged"""
+    return parse_cache.cached(file_path, 'ast', _read_python_ast)
+
+
+def _parse_python_file_isolated(file_path):
+    """Parse a Python file into a registry of its own, raising on errors"""
+    registry = ModelRegistry()
+    # The whole result is cached, so caching the AST as well would only cost a second entry
+    tree = _read_python_ast(file_path)
+
+    # First pass: gather model and inheritance information
+    ModelVisitor(file_path, registry).visit(tree)
+
+    # Second pass: gather field definitions
+    field_visitor = FieldVisitor(file_path, registry)
+    field_visitor.visit(tree)
+
+    # The fields are returned separately and re-registered on merge
+    registry.drop_field_index()
+    return registry, field_visitor.fields, field_visitor.method_overrides, field_visitor.all_methods
+
+
+def parse_python_file_isolated(file_path):
+    """
+    Parse a Python file into a registry of its own, reusing the on-disk parse cache
+
+    The result only depends on the file, so it is cached as a whole; merge it into the
+    main registry with ModelRegistry.bulk_ingest().
+
+    Returns:
+        tuple: (registry, fields, method_overrides, methods), empty if the file can't be parsed
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            file_content = f.read()
+        # Module names can fall back to the base directory, so results depend on it
+        return parse_cache.cached(file_path, 'python', _parse_python_file_isolated, context=config.BASE_DIR)
+    except Exception as e:
+        logger.error(f"Error parsing Python file {file_path}: {e}",
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
+        return ModelRegistry(), [], [], []
+
 
-        tree = ast.parse(file_content)
+def parse_python_file(file_path, registry, tree=None):
+    """
+    Parse Python file to extract model and field information
+
+    Args:
+        file_path: Path of the Python file
+        registry: ModelRegistry to register the models and fields in
+        tree: AST of the file if it was already loaded
+    """
+    try:
+        if tree is None:
+            tree = load_python_ast(file_path)
 
         # First pass: gather model and inheritance information
         model_visitor = ModelVisitor(file_path, registry)
@@ -396,7 +413,8 @@ def parse_python_file(file_path, registry):
 
         return field_visitor.fields, field_visitor.method_overrides, field_visitor.all_methods
     except Exception as e:
-        logger.error(f"Error parsing Python file {file_path}: {e}")
+        logger.error(f"Error parsing Python file {file_path}: {e}",
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         return [], [], []
 
 
@@ -414,14 +432,17 @@ def parse_python_files(base_dir, registry):
 
     # First pass: Extract model definitions and inheritance
     logger.info("Extracting model definitions and inheritance...")
+    # Holding every tree until the second pass costs memory in proportion to the whole codebase,
+    # so trees are only kept when there is no parse cache to reload them from cheaply
+    trees = None if config.PARSE_CACHE_DIR else {}
     for file_path in file_list:
         if file_path.endswith('__manifest__.py'):
             continue
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            tree = ast.parse(content)
+            tree = load_python_ast(file_path)
+            if trees is not None:
+                trees[file_path] = tree
             visitor = ModelVisitor(file_path, registry)
             visitor.visit(tree)
         except Exception as e:
@@ -435,7 +456,8 @@ def parse_python_files(base_dir, registry):
         if file_path.endswith('__manifest__.py'):
             continue
 
-        fields, method_overrides, methods = parse_python_file(file_path, registry)
+        tree = trees.pop(file_path, None) if trees is not None else None
+        fields, method_overrides, methods = parse_python_file(file_path, registry, tree)
         all_fields.extend(fields)
         all_method_overrides.extend(method_overrides)
         all_methods.extend(methods)
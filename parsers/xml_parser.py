@@ -1,6 +1,7 @@
 """XML file parser for Odoo analyzer with improved data/view distinction"""
 import logging
 import os
+import platform
 import re
 from collections import defaultdict
 from utils.file_utils import get_files, get_module_name
@@ -8,17 +9,27 @@ from models.field_usage import FieldUsage
 
 logger = logging.getLogger(__name__)
 
-# Try to import lxml for better XML parsing if available
-try:
-    from lxml import etree as ET
-
-    USING_LXML = True
-except ImportError:
-    # Fall back to standard ElementTree
+# Try to import lxml for better XML parsing if available. lxml is a CPython C extension that
+# runs slowly through PyPy's compatibility layer, so PyPy uses the JIT-compiled ElementTree instead.
+if platform.python_implementation() == 'PyPy':
     import xml.etree.ElementTree as ET
 
     USING_LXML = False
-    logger.info("Using standard ElementTree for XML parsing. Consider installing lxml for better performance.")
+else:
+    try:
+        from lxml import etree as ET
+
+        USING_LXML = True
+    except ImportError:
+        # Fall back to standard ElementTree
+        import xml.etree.ElementTree as ET
+
+        USING_LXML = False
+        logger.info("Using standard ElementTree for XML parsing. Consider installing lxml for better performance.")
+
+# Every extractor matches descendants of the root element, e.g. <a><field name="x"/></a>,
+# so smaller files can't hold any view definition or field usage
+MIN_XML_FILE_SIZE = 16
 
 # Record types classification
 RECORD_TYPE_VIEW = 'view'
@@ -311,9 +322,9 @@ def extract_standard_fields(root, registry, module, file_path, field_usages, cla
                             # Extract fields from arch XML
                             _extract_fields_from_arch(arch_root, registry, module, file_path, 
                                                      field_usages, record_id, classified_records)
-                            logger.debug(f"Extracted fields from arch for view {record_id}")
+                            logger.debug("Extracted fields from arch for view %s", record_id)
             except Exception as e:
-                logger.debug(f"Error extracting fields from arch: {e}")
+                logger.debug("Error extracting fields from arch: %s", e)
             continue
 
         # Skip other meta fields
@@ -577,8 +588,22 @@ def process_field_matches(matches, elem, root, registry, module, file_path, fiel
         field_usages.append(usage)
 
 
-def parse_xml_file(file_path, registry):
-    """Parse XML file to extract field usage information with better error handling"""
+def create_xml_parser():
+    """Create an lxml parser with namespace cleanup and error recovery (None for ElementTree)"""
+    if USING_LXML:
+        return ET.XMLParser(ns_clean=True, recover=True, resolve_entities=False)
+    return None
+
+
+def parse_xml_file(file_path, registry, parser=None):
+    """
+    Parse XML file to extract field usage information with better error handling
+
+    Args:
+        file_path: Path of the XML file
+        registry: Model registry
+        parser: Optional lxml parser to reuse across files (created per file if not given)
+    """
     try:
         # Track field usage in this file
         field_usages = []
@@ -587,8 +612,7 @@ def parse_xml_file(file_path, registry):
         try:
             # Attempt to parse with proper namespace handling and recovery (for lxml)
             if USING_LXML:
-                parser = ET.XMLParser(ns_clean=True, recover=True, resolve_entities=False)
-                tree = ET.parse(file_path, parser=parser)
+                tree = ET.parse(file_path, parser=parser or create_xml_parser())
             else:
                 # Fall back to standard parsing
                 tree = ET.parse(file_path)
@@ -604,13 +628,15 @@ def parse_xml_file(file_path, registry):
             # First pass: extract view definitions and models
             extract_view_definitions(root, registry, module)
         except Exception as e:
-            logger.error(f"Error extracting view definitions from {file_path}: {e}")
+            logger.error(f"Error extracting view definitions from {file_path}: {e}",
+                         exc_info=logger.isEnabledFor(logging.DEBUG))
 
         try:
             # Second pass: extract field usage
             extract_field_usage(root, registry, module, file_path, field_usages)
         except Exception as e:
-            logger.error(f"Error extracting field usage from {file_path}: {e}")
+            logger.error(f"Error extracting field usage from {file_path}: {e}",
+                         exc_info=logger.isEnabledFor(logging.DEBUG))
 
         # Convert to dictionary format for easier processing
         field_usage_dict = defaultdict(list)
@@ -625,25 +651,47 @@ def parse_xml_file(file_path, registry):
         logger.error(f"Recursion depth exceeded while parsing XML file {file_path}. Skipping file.")
         return {}
     except Exception as e:
-        logger.error(f"Error parsing XML file {file_path}: {e}")
+        logger.error(f"Error parsing XML file {file_path}: {e}",
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         return {}
 
 
 def parse_xml_files(base_dir, registry):
-    """Parse all XML files in the directory"""
-    logger.info("Processing XML files for view definitions and field usage...")
-    field_usage = {}
+    """
+    Parse all XML files in the directory or list of files
+
+    Files that fail to process are logged and skipped.
 
-    for file_path in get_files(base_dir, '.xml'):
+    Args:
+        base_dir: Directory to search, or a list of XML file paths
+        registry: Model registry
+    """
+    logger.debug("Processing XML files for view definitions and field usage...")
+    field_usage = defaultdict(list)
+
+    # Handle both directory paths and lists of file paths
+    if isinstance(base_dir, list):
+        file_list = base_dir
+    else:
+        file_list = get_files(base_dir, '.xml')
+
+    # One parser instance is reused for the whole batch
+    parser = create_xml_parser()
+
+    for file_path in file_list:
         try:
-            file_usage = parse_xml_file(file_path, registry)
+            # Skip empty and trivial files without parsing them
+            if os.path.getsize(file_path) < MIN_XML_FILE_SIZE:
+                continue
+
+            file_usage = parse_xml_file(file_path, registry, parser)
             # Merge usage data
             for field_key, usages in file_usage.items():
-                if field_key not in field_usage:
-                    field_usage[field_key] = []
                 field_usage[field_key].extend(usages)
         except Exception as e:
-            logger.error(f"Error processing XML file {file_path}: {e}")
+            logger.error(f"Error processing XML file {file_path}: {e}",
+                         exc_info=logger.isEnabledFor(logging.DEBUG))
 
-    logger.info(f"Found {len(field_usage)} unique fields referenced in XML files")
-    return field_usage
\ No newline at end of file
+    logger.debug("Found %d unique fields referenced in XML files", len(field_usage))
+    # Return a plain dict so lookups by callers don't insert keys
+    return dict(field_usage)
@@ -0,0 +1,88 @@
+"""Tests for merging per-file parse results into the model registry"""
+import os
+import tempfile
+import textwrap
+import unittest
+
+import config
+from models.registry import ModelRegistry
+from parsers.python_parser import parse_python_file_isolated, parse_python_files
+
+# x.a inherits x.b in a file parsed before the one declaring that x.b inherits x.cc
+FILES = {
+    'base_c.py': '''
+        from odoo import models, fields
+
+        class XC(models.Model):
+            _name = 'x.cc'
+            f = fields.Char(string='F')
+    ''',
+    'zz_second.py': '''
+        from odoo import models, fields
+
+        class XA(models.Model):
+            _name = 'x.a'
+            _inherit = 'x.b'
+            f = fields.Char(string='F', required=True)
+    ''',
+    'aa_first.py': '''
+        from odoo import models
+
+        class XB(models.Model):
+            _name = 'x.b'
+            _inherit = 'x.cc'
+    ''',
+}
+
+
+class BulkIngestTest(unittest.TestCase):
+    def setUp(self):
+        self._config = config.BASE_DIR, config.PARSE_CACHE_DIR
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        config.BASE_DIR = self._tmp_dir.name
+        config.PARSE_CACHE_DIR = None
+
+        models_dir = os.path.join(self._tmp_dir.name, 'mod1', 'models')
+        os.makedirs(models_dir)
+        self.file_paths = []
+        for file_name, source in FILES.items():
+            file_path = os.path.join(models_dir, file_name)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(textwrap.dedent(source))
+            self.file_paths.append(file_path)
+
+    def tearDown(self):
+        config.BASE_DIR, config.PARSE_CACHE_DIR = self._config
+        self._tmp_dir.cleanup()
+
+    def _ingest(self):
+        registry = ModelRegistry()
+        results = [parse_python_file_isolated(file_path) for file_path in self.file_paths]
+        registry.bulk_ingest((partial, fields) for partial, fields, _, _ in results)
+        return registry
+
+    def test_links_field_through_inherit_declared_in_later_file(self):
+        field = self._ingest().get_field('x.a', 'f')
+
+        self.assertTrue(field.is_extension)
+        self.assertEqual(field.field_key, 'x.cc.f')
+        self.assertEqual(field.root_model, 'x.cc')
+        self.assertEqual(field.added_attributes, {'required': 'True'})
+
+    def test_matches_two_pass_parse(self):
+        two_pass_registry = ModelRegistry()
+        parse_python_files(self.file_paths, two_pass_registry)
+        registry = self._ingest()
+
+        for model_name, field_name in (('x.cc', 'f'), ('x.a', 'f')):
+            expected = two_pass_registry.get_field(model_name, field_name)
+            field = registry.get_field(model_name, field_name)
+            self.assertEqual((field.field_key, field.is_extension, field.extended_from, field.added_attributes,
+                              field.modified_attributes, field.removed_attributes),
+                             (expected.field_key, expected.is_extension, expected.extended_from,
+                              expected.added_attributes, expected.modified_attributes,
+                              expected.removed_attributes))
+
+
+if __name__ == '__main__':
+    unittest.main()
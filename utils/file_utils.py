@@ -1,5 +1,9 @@
 """File utilities for Odoo analyzer"""
+import mmap
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 import config
 import logging
@@ -9,6 +13,16 @@ logger = logging.getLogger(__name__)
 # Base directory - will be overridden by command line args
 BASE_DIR = ""
 
+# Common Odoo module subdirectories; the module name is the directory before these
+MODULE_SUBDIRS = frozenset({'models', 'views', 'wizard', 'wizards', 'controllers', 'static', 'data', 'security',
+                            'report', 'tests'})
+
+# Common intermediate directories between the base directory and the modules
+INTERMEDIATE_DIRS = frozenset({'odoo', 'addons', 'user', 'enterprise', 'custom'})
+
+# Files at least this large are memory-mapped instead of read, mapping small files costs more than copying them
+MMAP_THRESHOLD = 16 * 1024
+
 def get_module_name(file_path):
     r"""Extract module name from file path
     
@@ -18,21 +32,53 @@ def get_module_name(file_path):
     
     The module name is the directory containing __manifest__.py, which is typically
     the directory before 'models', 'views', 'wizard', etc.
+
+    Results are cached per directory, since all files in a directory usually belong to the same module.
     """
-    parts = Path(file_path).parts
-    
+    directory, filename = os.path.split(file_path)
+    if filename and filename not in MODULE_SUBDIRS:
+        module = _get_directory_module(directory, config.BASE_DIR)
+        if module is not None:
+            return module
+    return _get_module_name_from_parts(Path(file_path).parts, config.BASE_DIR)
+
+@lru_cache(maxsize=None)
+def _get_directory_module(directory, base_dir):
+    """
+    Get the module of the files in a directory, as get_module_name() would
+
+    Returns None if the module name depends on the file name, which only happens when
+    the file sits right below the base directory or intermediate directories.
+    """
+    parts = Path(directory).parts
+
+    for i, part in enumerate(parts):
+        if part in MODULE_SUBDIRS and i > 0:
+            return parts[i - 1]
+
+    if base_dir:
+        base_dir_name = Path(base_dir).name
+        for i, part in enumerate(parts):
+            if part == base_dir_name:
+                for potential_module in parts[i + 1:]:
+                    if potential_module not in INTERMEDIATE_DIRS:
+                        return potential_module
+                return None
+
+    return "unknown"
+
+def _get_module_name_from_parts(parts, base_dir):
+    """Extract module name from the parts of a file path"""
     # Look for common Odoo module subdirectories (models, views, wizard, etc.)
     # The module name is the directory before these
-    module_subdirs = {'models', 'views', 'wizard', 'wizards', 'controllers', 'static', 'data', 'security', 'report', 'tests'}
-    
     for i, part in enumerate(parts):
-        if part in module_subdirs and i > 0:
+        if part in MODULE_SUBDIRS and i > 0:
             # Module name is the directory before the subdirectory
             return parts[i - 1]
     
     # Fallback: if BASE_DIR is set, find first part after it
-    if config.BASE_DIR:
-        base_dir_name = Path(config.BASE_DIR).name
+    if base_dir:
+        base_dir_name = Path(base_dir).name
         for i, part in enumerate(parts):
             if part == base_dir_name and i + 1 < len(parts):
                 # Skip intermediate directories like 'odoo', 'user', 'enterprise'
@@ -40,7 +86,7 @@ def get_module_name(file_path):
                 for j in range(i + 1, len(parts)):
                     potential_module = parts[j]
                     # Skip common intermediate directories
-                    if potential_module not in {'odoo', 'addons', 'user', 'enterprise', 'custom'}:
+                    if potential_module not in INTERMEDIATE_DIRS:
                         return potential_module
                 # If we only have intermediate dirs, return the first one
                 return parts[i + 1] if i + 1 < len(parts) else "unknown"
@@ -48,13 +94,66 @@ def get_module_name(file_path):
     # Last fallback
     return "unknown"
 
-def get_files(base_dir, extension):
-    """Get all files with a specific extension in a directory"""
-    for root, _, files in os.walk(base_dir):
+def get_files(base_dir, extension, prune=None):
+    """
+    Get all files with a specific extension in a directory
+
+    Args:
+        base_dir: Directory to search
+        extension: File extension to look for
+        prune: Optional callable(dir_path, filenames) returning True for directories
+               whose files and subdirectories should be skipped
+    """
+    for root, dirs, files in os.walk(base_dir):
+        if prune is not None and prune(root, files):
+            dirs[:] = []
+            continue
         for file in files:
             if file.endswith(extension):
                 yield os.path.join(root, file)
 
+def get_files_by_extension(base_dir, extensions, prune=None):
+    """
+    Get all files with any of the specified extensions in one walk over the directory
+
+    Args:
+        base_dir: Directory to search
+        extensions: File extensions to look for
+        prune: Optional callable(dir_path, filenames) returning True for directories
+               whose files and subdirectories should be skipped
+
+    Returns:
+        Dictionary of extension -> list of file paths, in the order get_files yields them
+    """
+    extensions = tuple(extensions)
+    files = {extension: [] for extension in extensions}
+    for root, dirs, filenames in os.walk(base_dir):
+        if prune is not None and prune(root, filenames):
+            dirs[:] = []
+            continue
+        for filename in filenames:
+            if filename.endswith(extensions):
+                file_path = os.path.join(root, filename)
+                for extension in extensions:
+                    if filename.endswith(extension):
+                        files[extension].append(file_path)
+    return files
+
+@contextmanager
+def open_bytes(file_path):
+    """
+    Get the content of a file as a bytes-like object
+
+    Large files are memory-mapped rather than copied into a bytes object. The content is
+    only valid inside the with block.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            yield f.read()
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                yield content
+
 def qualified_name(model, field):
     """Create a qualified field name (model.field)"""
     if not model:
@@ -98,20 +197,50 @@ def get_custom_modules(base_dir):
     return custom_modules
 
 
-def get_safe_files(base_dir, extension, exclude_patterns=None):
+def _scan_directory(path):
     """
-    Get files with the specified extension, excluding potentially problematic ones
+    List one directory with os.scandir
+
+    Returns:
+        tuple: (subdirectory paths, file names). Like os.walk, symlinked directories are
+               not descended into.
+    """
+    subdirs = []
+    filenames = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    filenames.append(entry.name)
+                elif not entry.is_symlink():
+                    subdirs.append(entry.path)
+    except OSError as e:
+        logger.error(f"Error scanning directory {path}: {e}")
+    return subdirs, filenames
+
+
+def get_safe_files_by_extension(base_dir, extensions, exclude_patterns=None, max_workers=16):
+    """
+    Get files with any of the specified extensions in one pass over the tree, excluding
+    potentially problematic ones
+
+    Directories are scanned level by level with a thread pool so the directory listing
+    and stat calls of sibling directories overlap.
 
     Args:
         base_dir: Base directory to search
-        extension: File extension to look for (e.g. '.py', '.xml')
+        extensions: File extensions to look for (e.g. ['.py', '.xml'])
         exclude_patterns: List of patterns to exclude (e.g. ['test_', 'demo_'])
+        max_workers: Maximum number of threads scanning directories
 
     Returns:
-        List of file paths
+        Dictionary of extension -> list of file paths
     """
-    if exclude_patterns is None:
-        exclude_patterns = []
+    exclude_patterns = list(exclude_patterns or [])
 
     # Add common problematic file patterns
     exclude_patterns.extend([
@@ -119,22 +248,49 @@ def get_safe_files(base_dir, extension, exclude_patterns=None):
         'demo/', 'demo_', '_demo.',
         'example/', 'example_', '_example.'
     ])
+    dir_patterns = [pattern for pattern in exclude_patterns if pattern.endswith('/')]
+    file_patterns = [pattern for pattern in exclude_patterns if not pattern.endswith('/')]
 
-    files = []
+    extensions = tuple(extensions)
+    files = {extension: [] for extension in extensions}
     try:
-        for root, _, filenames in os.walk(base_dir):
-            # Skip directories that match exclude patterns
-            if any(pattern in root for pattern in exclude_patterns if pattern.endswith('/')):
-                continue
-
-            for filename in filenames:
-                if filename.endswith(extension):
-                    # Skip files that match exclude patterns
-                    if any(pattern in filename for pattern in exclude_patterns if not pattern.endswith('/')):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            level = [base_dir]
+            while level:
+                next_level = []
+                for root, (subdirs, filenames) in zip(level, executor.map(_scan_directory, level)):
+                    # Skip directories that match exclude patterns (their subdirectories match too)
+                    if any(pattern in root for pattern in dir_patterns):
                         continue
+                    next_level.extend(subdirs)
 
-                    files.append(os.path.join(root, filename))
+                    for filename in filenames:
+                        if filename.endswith(extensions):
+                            # Skip files that match exclude patterns
+                            if any(pattern in filename for pattern in file_patterns):
+                                continue
+
+                            file_path = os.path.join(root, filename)
+                            for extension in extensions:
+                                if filename.endswith(extension):
+                                    files[extension].append(file_path)
+                level = next_level
     except Exception as e:
         logger.error(f"Error walking directory {base_dir}: {e}")
 
-    return files
\ No newline at end of file
+    return files
+
+
+def get_safe_files(base_dir, extension, exclude_patterns=None):
+    """
+    Get files with the specified extension, excluding potentially problematic ones
+
+    Args:
+        base_dir: Base directory to search
+        extension: File extension to look for (e.g. '.py', '.xml')
+        exclude_patterns: List of patterns to exclude (e.g. ['test_', 'demo_'])
+
+    Returns:
+        List of file paths
+    """
+    return get_safe_files_by_extension(base_dir, [extension], exclude_patterns)[extension]
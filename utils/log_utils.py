@@ -1,5 +1,6 @@
 """Logging utilities for Odoo analyzer"""
 import logging
+import logging.handlers
 import sys
 
 def setup_logging(level_name='INFO'):
@@ -24,3 +25,16 @@ def setup_logging(level_name='INFO'):
     logging.getLogger().addHandler(file_handler)
     
     return logging.getLogger()
+
+def unbuffer_log_handlers():
+    """
+    Replace the root logger's memory buffers by the handlers they write to
+
+    Worker processes exit without running atexit hooks, so records still in a buffer
+    would be lost. Unbuffered, every record reaches the log file as it is emitted.
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.MemoryHandler) and handler.target is not None:
+            root.removeHandler(handler)
+            root.addHandler(handler.target)
@@ -0,0 +1,220 @@
+"""On-disk cache of per-file parse results for Odoo analyzer"""
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import config
+from utils.file_utils import open_bytes
+
+logger = logging.getLogger(__name__)
+
+# Bump when the format of cached objects changes or the parsers change what they extract
+CACHE_VERSION = 3
+
+
+def file_key(path):
+    """Get the cache key of a file: its size and modification time"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def content_digest(path):
+    """Get the SHA-256 digest of a file's content"""
+    with open_bytes(path) as content:
+        return hashlib.sha256(content).hexdigest()
+
+
+def _entry_path(path, kind):
+    """
+    Get the cache file for a source file
+
+    Entries are sharded by the first two characters of the hash so no directory grows too large.
+    """
+    digest = hashlib.sha1(f"{kind}:{os.path.abspath(path)}".encode('utf-8')).hexdigest()
+    return os.path.join(config.PARSE_CACHE_DIR, digest[:2], f"{digest}.pickle")
+
+
+def _entry_version(kind, context):
+    """Get everything besides the file itself that a cached object depends on"""
+    # ASTs and other pickled objects are specific to the Python version
+    return CACHE_VERSION, sys.version_info[:2], kind, context
+
+
+def _read_entry(path, kind):
+    """Read the (version, key, digest, obj) cache entry of a path, or None if there is none usable"""
+    try:
+        with open(_entry_path(path, kind), 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug("Ignoring unreadable cache entry for %s: %s", path, e)
+        return None
+
+
+def _write_entry(path, kind, entry):
+    """Write the cache entry of a path, raising on errors"""
+    entry_path = _entry_path(path, kind)
+    os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+    # Write to a temporary file and rename it so concurrent workers never read a partial entry
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(entry_path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def get(path, kind, key=None, context=None):
+    """
+    Get the cached object for a file
+
+    An entry is up to date if the file's size and modification time are unchanged, or
+    failing that, if its content hash is (e.g. after a checkout touched the file).
+
+    Args:
+        path: Path of the source file
+        kind: Kind of parse result (e.g. 'ast', 'manifest')
+        key: File key from file_key(). Computed if not given.
+        context: Optional picklable value the parse result depends on besides the file
+
+    Returns:
+        The cached object, or None if caching is disabled or there is no up to date entry
+    """
+    if not config.PARSE_CACHE_DIR:
+        return None
+    try:
+        if key is None:
+            key = file_key(path)
+    except OSError:
+        return None
+    entry = _read_entry(path, kind)
+    if entry is None:
+        return None
+    version, cached_key, cached_digest, obj = entry
+
+    if version != _entry_version(kind, context):
+        return None
+    if cached_key == key:
+        return obj
+
+    # The file was touched; reuse the entry if its content is unchanged
+    try:
+        digest = content_digest(path)
+    except OSError:
+        return None
+    if digest != cached_digest:
+        return None
+    put(path, kind, obj, key, digest, context)
+    return obj
+
+
+def put(path, kind, obj, key=None, digest=None, context=None):
+    """
+    Store the parse result of a file in the cache
+
+    Args:
+        path: Path of the source file
+        kind: Kind of parse result (e.g. 'ast', 'manifest')
+        obj: Picklable parse result
+        key: File key from file_key() taken before the file was read. Computed if not given.
+        digest: Content digest from content_digest() taken before the file was read. Computed if not given.
+        context: Optional picklable value the parse result depends on besides the file
+    """
+    if not config.PARSE_CACHE_DIR:
+        return
+    try:
+        if key is None:
+            key = file_key(path)
+        if digest is None:
+            digest = content_digest(path)
+        _write_entry(path, kind, (_entry_version(kind, context), key, digest, obj))
+    except Exception as e:
+        logger.debug("Could not cache parse result for %s: %s", path, e)
+
+
+def cached(path, kind, parse, context=None):
+    """
+    Get the parse result of a file from the cache, parsing and caching it on a miss
+
+    Args:
+        path: Path of the source file
+        kind: Kind of parse result (e.g. 'ast', 'manifest')
+        parse: Function that parses path. Exceptions it raises are propagated and nothing is cached.
+        context: Optional picklable value the parse result depends on besides the file
+    """
+    if not config.PARSE_CACHE_DIR:
+        return parse(path)
+
+    # Take the key and digest before parsing so a file changed meanwhile is not cached as up to date
+    key = file_key(path)
+    obj = get(path, kind, key, context)
+    if obj is None:
+        digest = content_digest(path)
+        obj = parse(path)
+        put(path, kind, obj, key, digest, context)
+    return obj
+
+
+def tree_key(paths):
+    """
+    Get the cache key of a set of files: a hash of their paths, sizes and modification times
+
+    Raises OSError if a file can't be accessed.
+    """
+    tree_hash = hashlib.sha256()
+    for path in sorted(paths):
+        size, mtime_ns = file_key(path)
+        tree_hash.update(f"{path}\0{size}\0{mtime_ns}\n".encode('utf-8', 'surrogateescape'))
+    return tree_hash.hexdigest()
+
+
+def get_tree(base_dir, kind, key, context=None):
+    """
+    Get the cached result of analyzing a directory tree
+
+    Unlike single files, trees are not hashed by content, so an entry is only up to date if
+    none of the files was added, removed or touched.
+
+    Args:
+        base_dir: Root of the directory tree
+        kind: Kind of analysis result (e.g. 'migration')
+        key: Tree key from tree_key() of the files the result is computed from
+        context: Optional picklable value the result depends on besides the files
+
+    Returns:
+        The cached object, or None if caching is disabled or there is no up to date entry
+    """
+    if not config.PARSE_CACHE_DIR:
+        return None
+    entry = _read_entry(base_dir, kind)
+    if entry is None:
+        return None
+    version, cached_key, _, obj = entry
+    if version != _entry_version(kind, context) or cached_key != key:
+        return None
+    return obj
+
+
+def put_tree(base_dir, kind, obj, key, context=None):
+    """
+    Store the result of analyzing a directory tree in the cache
+
+    Args:
+        base_dir: Root of the directory tree
+        kind: Kind of analysis result (e.g. 'migration')
+        obj: Picklable analysis result
+        key: Tree key from tree_key() taken before the files were read
+        context: Optional picklable value the result depends on besides the files
+    """
+    if not config.PARSE_CACHE_DIR:
+        return
+    try:
+        _write_entry(base_dir, kind, (_entry_version(kind, context), key, None, obj))
+    except Exception as e:
+        logger.debug("Could not cache analysis result for %s: %s", base_dir, e)
@@ -0,0 +1,36 @@
+"""Process pools of analysis workers for Odoo analyzer"""
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import config
+from utils.log_utils import unbuffer_log_handlers
+
+
+def init_worker(base_dir, parse_cache_dir, log_level, initializer=None, initargs=()):
+    """Initialize a worker process, then run the pool's own initializer if any"""
+    # Spawned workers don't inherit the configuration set in main()
+    config.BASE_DIR = base_dir
+    config.PARSE_CACHE_DIR = parse_cache_dir
+    # Only let warnings and errors through so workers don't contend for the log file,
+    # unless debugging. Pool workers exit without flushing buffers, so records are written right away.
+    logging.getLogger().setLevel(log_level)
+    unbuffer_log_handlers()
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def create_worker_pool(max_workers, initializer=None, initargs=()):
+    """
+    Create a process pool whose workers use the configuration and log level of this process
+
+    Args:
+        max_workers: Number of worker processes
+        initializer: Optional picklable callable run in each worker after the common setup
+        initargs: Arguments of initializer
+    """
+    root_logger = logging.getLogger()
+    # Forked workers inherit buffered log records, so write them out first to not write them twice
+    for handler in root_logger.handlers:
+        handler.flush()
+    log_level = logging.DEBUG if root_logger.isEnabledFor(logging.DEBUG) else logging.WARNING
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                               initargs=(config.BASE_DIR, config.PARSE_CACHE_DIR, log_level, initializer, initargs))